@@ -1,54 +1,96 @@
 from __future__ import annotations
-from typing import Dict, List, Optional, Set, Tuple
-from implicants import derive_prime_implicants, implicant_covers_input
+import heapq
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+from implicants import Implicant, derive_prime_implicants, implicant_covers_input
+from implicants import bits_to_implicant, trit_formatter, implicant_covers_any
 from implicants import build_onset_terms
 
-def build_minterm_to_pis(inputs_bits, onset_minterms, pis) -> Dict[int, Set[str]]:
+def build_minterm_to_pis(inputs_bits, onset_minterms, pis) -> Dict[int, Set[Implicant]]:
     idx_by_bits = {bits: idx for idx, bits in enumerate(inputs_bits)}
     on_indices: Set[int] = set(idx_by_bits[b] for b in onset_minterms)
-    table: Dict[int, Set[str]] = {i: set() for i in on_indices}
+    table: Dict[int, Set[Implicant]] = {i: set() for i in on_indices}
     for pi in pis:
         for bits, idx in idx_by_bits.items():
-            if bits in onset_minterms and implicant_covers_input(pi, bits):
+            if bits in onset_minterms and implicant_covers_input(pi, int(bits, 2)):
                 table[idx].add(pi)
     return table
 
-def pick_epis(minterm_to_pis: Dict[int, Set[str]]) -> Tuple[Set[str], Set[int]]:
-    epis: Set[str] = set()
-    covered: Set[int] = set()
+def build_cover_bitmasks(
+    covers: Dict[Implicant, Set[int]], all_on_indices: Set[int]
+) -> Tuple[Dict[Implicant, int], List[int]]:
+    """Mã hoá covers[pi] thành bitmask trên chỉ số ON đánh lại liên tục 0..|ON|-1."""
+    order = sorted(all_on_indices)
+    pos = {m: k for k, m in enumerate(order)}
+    covers_bm: Dict[Implicant, int] = {}
+    for pi, covered in covers.items():
+        bm = 0
+        for m in covered:
+            k = pos.get(m)
+            if k is not None:
+                bm |= 1 << k
+        covers_bm[pi] = bm
+    return covers_bm, order
+
+def bitmask_to_indices(bm: int, order: List[int]) -> Set[int]:
+    """Bitmask trên chỉ số ON đánh lại -> tập chỉ số minterm gốc."""
+    return {order[k] for k, b in enumerate(reversed(bin(bm)[2:])) if b == '1'}
+
+def pick_epis(
+    minterm_to_pis: Dict[int, Set[Implicant]], covers_bm: Dict[Implicant, int], order: List[int]
+) -> Tuple[Set[Implicant], Set[int]]:
+    epis: Set[Implicant] = set()
     for m, cand in minterm_to_pis.items():
         if len(cand) == 1:
             epis.add(next(iter(cand)))
-    if epis:
-        for m, cand in minterm_to_pis.items():
-            if any(pi in cand for pi in epis):
-                covered.add(m)
-    return epis, covered
-
-def score_pi_for_greedy(pi: str, uncovered: Set[int], covers: Dict[str, Set[int]]) -> Tuple[int, int, int]:
-    cover_gain = len(covers.get(pi, set()) & uncovered)
-    dash_count = pi.count('-')
-    literal_count = len(pi) - dash_count
+    # Các minterm được EPI che = hợp bitmask của các EPI
+    covered_bm = 0
+    for pi in epis:
+        covered_bm |= covers_bm.get(pi, 0)
+    return epis, bitmask_to_indices(covered_bm, order)
+
+def build_pi_meta(pis: List[Implicant], n_bits: int) -> Dict[Implicant, Tuple[int, int]]:
+    """(dash_count, literal_count) của từng PI, tính một lần: literal = popcount(care)."""
+    meta: Dict[Implicant, Tuple[int, int]] = {}
+    for pi in pis:
+        literal_count = pi[1].bit_count()
+        meta[pi] = (n_bits - literal_count, literal_count)
+    return meta
+
+def score_pi_for_greedy(
+    pi: Implicant, uncovered: int, covers_bm: Dict[Implicant, int], meta: Tuple[int, int]
+) -> Tuple[int, int, int]:
+    cover_gain = (covers_bm.get(pi, 0) & uncovered).bit_count()
+    dash_count, literal_count = meta
     return (cover_gain, dash_count, -literal_count)
 
-def greedy_complete_cover(pis, covers, already_selected, all_on_indices) -> Tuple[Set[str], Set[int]]:
+def greedy_complete_cover(pis, covers_bm, already_selected, order, n_bits) -> Tuple[Set[Implicant], Set[int]]:
     selected = set(already_selected)
-    uncovered = set(all_on_indices)
+    uncovered = (1 << len(order)) - 1
     for pi in selected:
-        uncovered -= covers.get(pi, set())
-    remaining = [pi for pi in pis if pi not in selected]
-    while uncovered:
-        best_pi, best_score = None, (0, 0, 0)
-        for pi in remaining:
-            sc = score_pi_for_greedy(pi, uncovered, covers)
-            if sc > best_score:
-                best_score, best_pi = sc, pi
-        if best_pi is None or best_score[0] == 0:
-            break
-        selected.add(best_pi)
-        uncovered -= covers.get(best_pi, set())
-        remaining = [pi for pi in remaining if pi != best_pi]
-    return selected, uncovered
+        uncovered &= ~covers_bm.get(pi, 0)
+    # Lazy greedy: gain chỉ có thể giảm, nên phần tử ở đỉnh heap có gain
+    # tính lại bằng gain đã lưu chắc chắn là lựa chọn tốt nhất.
+    # Khoá heap là score đảo dấu, hoà thì theo thứ tự trong `pis`.
+    pi_meta = build_pi_meta(pis, n_bits)
+    heap = []
+    for order_idx, pi in enumerate(pis):
+        if pi in selected:
+            continue
+        sc = score_pi_for_greedy(pi, uncovered, covers_bm, pi_meta[pi])
+        if sc[0] > 0:
+            heap.append((-sc[0], -sc[1], -sc[2], order_idx, pi))
+    heapq.heapify(heap)
+    while uncovered and heap:
+        neg_gain, neg_dash, literal_count, order_idx, pi = heapq.heappop(heap)
+        gain = (covers_bm.get(pi, 0) & uncovered).bit_count()
+        if gain == 0:
+            continue
+        if gain != -neg_gain:
+            heapq.heappush(heap, (-gain, neg_dash, literal_count, order_idx, pi))
+            continue
+        selected.add(pi)
+        uncovered &= ~covers_bm.get(pi, 0)
+    return selected, bitmask_to_indices(uncovered, order)
 
 def implicant_to_product_term(implicant: str, var_names: Optional[List[str]] = None) -> str:
     N = len(implicant)
@@ -66,58 +108,70 @@ def build_sum_of_products(selected_pis: List[str], var_names: Optional[List[str]
     return ' + '.join(implicant_to_product_term(pi, var_names) for pi in selected_pis) if selected_pis else "0"
 
 def cubes_for_espresso(selected_pis: List[str], n_outputs: int, which_output: int) -> List[str]:
-    out = []
-    for pi in selected_pis:
-        y = ['0'] * n_outputs
-        y[which_output] = '1'
-        out.append(f"{pi} {''.join(y)}")
-    return out
+    y_str = '0' * which_output + '1' + '0' * (n_outputs - which_output - 1)
+    return [f"{pi} {y_str}" for pi in selected_pis]
 
 def select_cover_for_one_output(
     inputs_bits: List[str],
     outputs_trits: List[str],
     which_output: int,
     input_var_names: Optional[List[str]] = None,
+    pi_cache: Optional[Dict[FrozenSet[str], List[Implicant]]] = None,
 ) -> Tuple[List[str], Set[int], str, List[str]]:
+    """
+    pi_cache (tuỳ chọn): ON ∪ DC -> danh sách PI đã lọc OFF. OFF chỉ phụ thuộc
+    vào ON ∪ DC nên các output có cùng tập này dùng chung một lần Q-M.
+    """
     onset_bits  = [x for x, y in zip(inputs_bits, outputs_trits) if y[which_output] == '1']
     dcare_bits  = [x for x, y in zip(inputs_bits, outputs_trits) if y[which_output] == '-']
     union_bits  = sorted(set(onset_bits) | set(dcare_bits))
-
-    pis = derive_prime_implicants(union_bits)
-    # Xác định tập OFF = toàn bộ - (ON ∪ DC)
-    off_bits = set(inputs_bits) - set(union_bits)
-
-    # Giữ lại chỉ những PI không che bất kỳ OFF nào
-    from implicants import implicant_covers_input
-    pis = [
-        pi for pi in pis
-        if not any(implicant_covers_input(pi, xoff) for xoff in off_bits)
-    ]
-
+    n_bits = len(inputs_bits[0])
+
+    # Không có minterm ON -> phủ rỗng, hàm = 0
+    if not onset_bits:
+        return [], set(), build_sum_of_products([], var_names=input_var_names), []
+
+    to_trits = trit_formatter(n_bits)
+    union_key = frozenset(union_bits)
+    if pi_cache is not None and union_key in pi_cache:
+        pis = pi_cache[union_key]
+    else:
+        pis = derive_prime_implicants([bits_to_implicant(b) for b in union_bits])
+        # Xác định tập OFF = toàn bộ - (ON ∪ DC)
+        off_bits = set(inputs_bits) - union_key
+
+        # Giữ lại chỉ những PI không che bất kỳ OFF nào (OFF rỗng thì bỏ qua)
+        if off_bits:
+            off_ints = {int(xoff, 2) for xoff in off_bits}
+            pis = [pi for pi in pis if not implicant_covers_any(pi, off_ints, n_bits)]
+        # Giữ thứ tự duyệt theo chuỗi trit để greedy phá hoà như trước
+        pis.sort(key=to_trits)
+        if pi_cache is not None:
+            pi_cache[union_key] = pis
 
     idx_by_bits = {bits: idx for idx, bits in enumerate(inputs_bits)}
-    on_indices: Set[int] = set(idx_by_bits[b] for b in onset_bits)
+    onset = [(int(b, 2), idx_by_bits[b]) for b in onset_bits]
+    on_indices: Set[int] = {idx for _, idx in onset}
 
-    covers: Dict[str, Set[int]] = {}
+    # Bảng phủ PI x ON: chỉ duyệt các minterm ON, mỗi ô là một phép AND/so sánh
+    covers: Dict[Implicant, Set[int]] = {}
     for pi in pis:
-        indices = set()
-        for bits, idx in idx_by_bits.items():
-            if bits in onset_bits and implicant_covers_input(pi, bits):
-                indices.add(idx)
-        covers[pi] = indices
+        mask, care = pi
+        covers[pi] = {idx for x, idx in onset if (x & care) == mask}
 
-    minterm_to_pis: Dict[int, Set[str]] = {i: set() for i in on_indices}
+    minterm_to_pis: Dict[int, Set[Implicant]] = {i: set() for i in on_indices}
     for pi, covered_set in covers.items():
         for i in covered_set:
             if i in minterm_to_pis:
                 minterm_to_pis[i].add(pi)
 
-    epis, _ = pick_epis(minterm_to_pis)
+    covers_bm, order = build_cover_bitmasks(covers, on_indices)
+    epis, _ = pick_epis(minterm_to_pis, covers_bm, order)
     selected_all, uncovered = greedy_complete_cover(
-        pis=pis, covers=covers, already_selected=epis, all_on_indices=on_indices
+        pis=pis, covers_bm=covers_bm, already_selected=epis, order=order, n_bits=n_bits
     )
 
-    selected_pis = sorted(selected_all)
+    selected_pis = sorted(map(to_trits, selected_all))
     sop = build_sum_of_products(selected_pis, var_names=input_var_names)
     cubes = cubes_for_espresso(selected_pis, n_outputs=len(outputs_trits[0]), which_output=which_output)
     return selected_pis, uncovered, sop, cubes
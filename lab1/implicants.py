@@ -1,55 +1,111 @@
 from __future__ import annotations
-from typing import Dict, List, Set, Tuple
+from functools import lru_cache
+from typing import Callable, Dict, List, Set, Tuple
 
-def combine_if_one_bit_diff(a: str, b: str) -> str | None:
+# Implicant mã hoá bằng cặp số nguyên N-bit (mask, care):
+#   - care: bit = 1 ở các vị trí xác định ('0'/'1'), bit = 0 ở vị trí '-'
+#   - mask: giá trị các bit xác định (luôn bằng 0 ở vị trí '-')
+# Bit cao nhất ứng với ký tự đầu tiên của chuỗi, giống int(bits, 2).
+Implicant = Tuple[int, int]
+
+def bits_to_implicant(bits: str) -> Implicant:
+    """Minterm dạng chuỗi '0'/'1' -> (mask, care) với mọi bit đều xác định."""
+    return int(bits, 2), (1 << len(bits)) - 1
+
+@lru_cache(maxsize=None)
+def trit_formatter(n_bits: int) -> Callable[[Implicant], str]:
+    """
+    Hàm (mask, care) -> chuỗi trit chuyên biệt cho độ rộng n_bits:
+    danh sách bit được tính sẵn một lần cho mỗi N.
+    """
+    bits = tuple(1 << pos for pos in range(n_bits - 1, -1, -1))
+
+    def to_trits(implicant: Implicant) -> str:
+        mask, care = implicant
+        return ''.join(('1' if mask & b else '0') if care & b else '-' for b in bits)
+
+    return to_trits
+
+def implicant_to_trits(implicant: Implicant, n_bits: int) -> str:
+    """(mask, care) -> chuỗi trit '0'/'1'/'-' dài n_bits."""
+    return trit_formatter(n_bits)(implicant)
+
+def combine_if_one_bit_diff(a: Implicant, b: Implicant) -> Implicant | None:
     """
     Chỉ cho gộp nếu:
-      - Tất cả các vị trí đều bằng nhau, TRỪ đúng 1 vị trí là 0/1 đối nghịch.
-      - Ở các vị trí có '-', cả hai phải đều '-' (không cho case '-' vs '0/1').
+      - Hai implicant có cùng vị trí '-' (care giống nhau).
+      - Các bit xác định khác nhau ĐÚNG 1 vị trí.
     """
-    diff = 0
-    out = []
-    for xa, xb in zip(a, b):
-        if xa == xb:
-            out.append(xa)  # có thể là '0'/'1' hoặc '-' giống nhau
-        else:
-            # nếu một bên là '-' còn bên kia là bit xác định -> KHÔNG gộp được
-            if xa == '-' or xb == '-':
-                return None
-            # khác nhau 0 vs 1 -> tính 1 khác biệt
-            diff += 1
-            if diff > 1:
-                return None
-            out.append('-')
-    # phải đúng 1 khác biệt
-    if diff != 1:
+    mask_a, care_a = a
+    mask_b, care_b = b
+    if care_a != care_b:
         return None
-    return ''.join(out)
+    d = mask_a ^ mask_b
+    if d and (d & (d - 1)) == 0:
+        return (mask_a & ~d, care_a & ~d)
+    return None
 
-def group_once(terms: List[str]) -> Tuple[List[str], List[str]]:
+def group_once(terms: List[Implicant]) -> Tuple[List[Implicant], List[Implicant]]:
     used = set()
-    new_terms_set: Set[str] = set()
-    terms_sorted = sorted(terms, key=lambda s: s.count('1'))
-    for i in range(len(terms_sorted)):
-        for j in range(i + 1, len(terms_sorted)):
-            c = combine_if_one_bit_diff(terms_sorted[i], terms_sorted[j])
-            if c is not None:
-                new_terms_set.add(c)
-                used.add(terms_sorted[i])
-                used.add(terms_sorted[j])
-    leftovers = [t for t in terms_sorted if t not in used]
+    new_terms_set: Set[Implicant] = set()
+    # Bạn gộp của t chỉ có thể là t với đúng một bit xác định 0 được bật lên 1
+    # (cùng care, nhiều hơn một bit '1') -> thử tối đa N ứng viên bằng tra set
+    # thay vì so với cả nhóm kế tiếp
+    term_set = set(terms)
+    for t in terms:
+        mask, care = t
+        zeros = care & ~mask
+        while zeros:
+            bit = zeros & -zeros
+            zeros ^= bit
+            partner = (mask | bit, care)
+            if partner in term_set:
+                new_terms_set.add((mask, care & ~bit))
+                used.add(t)
+                used.add(partner)
+    leftovers = [t for t in terms if t not in used]
     new_terms = sorted(new_terms_set)
     return new_terms, leftovers
 
-def implicant_covers_input(implicant: str, input_bits: str) -> bool:
-    return all(ic == '-' or ic == xb for ic, xb in zip(implicant, input_bits))
+def implicant_covers_input(implicant: Implicant, input_bits: int) -> bool:
+    mask, care = implicant
+    return (input_bits & care) == mask
+
+def implicant_covers_any(implicant: Implicant, inputs: Set[int], n_bits: int) -> bool:
+    """
+    True nếu implicant che ít nhất một phần tử của `inputs`.
+    Nếu khối có ít minterm hơn `inputs` thì liệt kê các minterm của khối
+    và tra tập, ngược lại thì quét `inputs`.
+    """
+    mask, care = implicant
+    free = ~care & ((1 << n_bits) - 1)
+    if (1 << free.bit_count()) > len(inputs):
+        return any((x & care) == mask for x in inputs)
+    sub = free
+    while True:
+        if (mask | sub) in inputs:
+            return True
+        if sub == 0:
+            return False
+        sub = (sub - 1) & free
 
-def implicant_covers_implicant(a: str, b: str) -> bool:
-    return all(xa == '-' or xa == xb for xa, xb in zip(a, b))
+def implicant_covers_implicant(a: Implicant, b: Implicant) -> bool:
+    mask_a, care_a = a
+    mask_b, care_b = b
+    return (care_a & ~care_b) == 0 and (mask_b & care_a) == mask_a
 
-def derive_prime_implicants(minterms: List[str]) -> List[str]:
+def derive_prime_implicants(minterms: List[Implicant]) -> List[Implicant]:
     current = sorted(set(minterms))
-    prime_implicants: Set[str] = set()
+    # Trường hợp suy biến: một minterm duy nhất, hoặc đủ cả 2^N minterm (PI = '----')
+    if len(current) <= 1:
+        return current
+    cares = {care for _, care in current}
+    if len(cares) == 1:
+        care = cares.pop()
+        n_bits = care.bit_length()
+        if care == (1 << n_bits) - 1 and len(current) == 1 << n_bits:
+            return [(0, 0)]
+    prime_implicants: Set[Implicant] = set()
     while True:
         new_terms, leftovers = group_once(current)
         prime_implicants.update(leftovers)
@@ -58,11 +114,19 @@ def derive_prime_implicants(minterms: List[str]) -> List[str]:
             break
         current = new_terms
     pis = sorted(prime_implicants)
-    non_redundant: List[str] = []
-    for i, pi in enumerate(pis):
-        is_covered = any(i != j and implicant_covers_implicant(pj, pi) for j, pj in enumerate(pis))
+    # Nhóm PI theo care: pj che pi khi care_j là tập con thực sự của care_i
+    # và (mask_i & care_j) nằm trong nhóm care_j -> tra dict thay vì so từng cặp
+    masks_by_care: Dict[int, Set[int]] = {}
+    for mask, care in pis:
+        masks_by_care.setdefault(care, set()).add(mask)
+    non_redundant: List[Implicant] = []
+    for mask, care in pis:
+        is_covered = any(
+            c != care and (c & ~care) == 0 and (mask & c) in masks
+            for c, masks in masks_by_care.items()
+        )
         if not is_covered:
-            non_redundant.append(pi)
+            non_redundant.append((mask, care))
     return sorted(set(non_redundant))
 
 def build_onset_terms(inputs_bits: List[str], outputs_bits: List[str], out_index: int) -> List[str]:
@@ -1,8 +1,6 @@
 from __future__ import annotations
 import sys
 import os
-from io import StringIO
-from contextlib import redirect_stdout
 from typing import List, Optional
 from truth_table import (
     parse_sum_of_minterms_file,
@@ -29,13 +27,9 @@ def _save_truth_table_markdown(
     output_names: List[str],
     out_path: str,
 ) -> None:
-    """Capture the markdown table and write it to `out_path`."""
-    buf = StringIO()
-    with redirect_stdout(buf):
-        print_truth_table_markdown(inputs_bits, outputs_trits, input_names, output_names)
-    md = buf.getvalue()
+    """Write the markdown table to `out_path`."""
     with open(out_path, "w", encoding="utf-8") as f:
-        f.write(md)
+        print_truth_table_markdown(inputs_bits, outputs_trits, input_names, output_names, file=f)
 
 
 def run_from_sum_file(
@@ -64,13 +58,16 @@ def run_from_sum_file(
         print(f"[i] Markdown truth table saved to: {md_path}")
 
     # Cover each output (console plain text)
+    # Outputs with the same ON∪DC universe share one prime-implicant derivation
     all_cubes: List[str] = []
+    pi_cache: dict = {}
     for k, out_name in enumerate(output_names):
         selected_pis, uncovered, sop, cubes = select_cover_for_one_output(
             inputs_bits=inputs_bits,
             outputs_trits=outputs_trits,
             which_output=k,
             input_var_names=input_names,
+            pi_cache=pi_cache,
         )
         print(f"\n=== {out_name} ===")
         print("PIs:", selected_pis)
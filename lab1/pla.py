@@ -1,4 +1,5 @@
 from __future__ import annotations
+import io
 from typing import List, Optional
 
 def build_full_pla(
@@ -16,11 +17,10 @@ def build_full_pla(
         input_names  = [f"x{i+1}" for i in range(N)]
     if output_names is None:
         output_names = [f"f{i+1}" for i in range(M)]
-    lines = []
-    lines.append(f".i {N}")
-    lines.append(f".o {M}")
-    lines.append(".ilb " + " ".join(input_names))
-    lines.append(".ob " + " ".join(output_names))
-    lines.extend(all_cubes)
-    lines.append(".e")
-    return "\n".join(lines)
+    buf = io.StringIO()
+    buf.write(f".i {N}\n.o {M}\n.ilb " + " ".join(input_names) + "\n.ob " + " ".join(output_names) + "\n")
+    for cube in all_cubes:
+        buf.write(cube)
+        buf.write("\n")
+    buf.write(".e")
+    return buf.getvalue()
@@ -1,12 +1,15 @@
 from __future__ import annotations
-import itertools
+import os
 import random
-from typing import Dict, List, Optional, Set, Tuple
+import sys
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Set, TextIO, Tuple
 
 def gen_all_input_combinations(n_inputs: int) -> List[str]:
     if n_inputs < 1:
         raise ValueError("n_inputs must be >= 1")
-    return [''.join(bits) for bits in itertools.product('01', repeat=n_inputs)]
+    fmt = f'0{n_inputs}b'
+    return [format(i, fmt) for i in range(1 << n_inputs)]
 
 def build_outputs_from_minterm_indices(
     n_inputs: int,
@@ -20,10 +23,46 @@ def build_outputs_from_minterm_indices(
     '-' denotes don't care (used like 1 during grouping only).
     """
     inputs_bits = gen_all_input_combinations(n_inputs)
-    max_index = (1 << n_inputs) - 1
     out_names = sorted(outputs_spec.keys())
+    _validate_minterm_spec(n_inputs, outputs_spec)
+
+    # Build one column per output by scattering only the ON/DC indices,
+    # then zip the columns into rows.
+    n_rows = 1 << n_inputs
+    cols: List[str] = []
+    for name in out_names:
+        on_set, dc_set = outputs_spec[name]
+        col = bytearray(b'0') * n_rows
+        for i in on_set:
+            col[i] = ord('1')
+        for i in dc_set:
+            col[i] = ord('-')
+        cols.append(col.decode('ascii'))
+    rows: List[str] = list(map(''.join, zip(*cols))) if cols else [''] * n_rows
+    return inputs_bits, rows, out_names
+
+def build_single_output_from_minterm_indices(
+    n_inputs: int,
+    outputs_spec: Dict[str, Tuple[Set[int], Set[int]]],  # name -> (on_set, dc_set)
+    output_idx: int,
+) -> Tuple[Set[int], Set[int]]:
+    """
+    Returns (on_set, dc_set) of the output at position output_idx in sorted
+    name order, validated like build_outputs_from_minterm_indices but
+    without building the 2^N x M trit table.
+    """
+    if n_inputs < 1:
+        raise ValueError("n_inputs must be >= 1")
+    _validate_minterm_spec(n_inputs, outputs_spec)
+    on_set, dc_set = outputs_spec[sorted(outputs_spec.keys())[output_idx]]
+    return set(on_set), set(dc_set)
 
-    # validate indices and overlap
+def _validate_minterm_spec(
+    n_inputs: int,
+    outputs_spec: Dict[str, Tuple[Set[int], Set[int]]],
+) -> None:
+    """Raise ValueError on out-of-range indices or ON/DC overlap."""
+    max_index = (1 << n_inputs) - 1
     for name, (on_set, dc_set) in outputs_spec.items():
         bad_on = [i for i in on_set if i < 0 or i > max_index]
         bad_dc = [i for i in dc_set if i < 0 or i > max_index]
@@ -34,21 +73,6 @@ def build_outputs_from_minterm_indices(
         if (on_set & dc_set):
             raise ValueError(f"Output '{name}' has overlap between ON and DC: {sorted(on_set & dc_set)}")
 
-    M = len(out_names)
-    rows: List[str] = []
-    for i in range(1 << n_inputs):
-        chars = []
-        for name in out_names:
-            on_set, dc_set = outputs_spec[name]
-            if i in on_set:
-                chars.append('1')
-            elif i in dc_set:
-                chars.append('-')
-            else:
-                chars.append('0')
-        rows.append(''.join(chars))
-    return inputs_bits, rows, out_names
-
 def parse_sum_of_minterms_file(path: str) -> Dict[str, Tuple[Set[int], Set[int]]]:
     """
     Parse extended syntax with don't cares:
@@ -56,36 +80,52 @@ def parse_sum_of_minterms_file(path: str) -> Dict[str, Tuple[Set[int], Set[int]]
         g = sum{1,6} + d{0,3}
         h = sum{} d{}
     Returns: dict name -> (on_set, dc_set)
+
+    Results are memoized per (absolute path, mtime_ns, size): re-parsing an
+    unchanged file in the same process only copies the cached sets.
     """
+    st = os.stat(path)
+    cached = _parse_sum_of_minterms_cached(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    # Fresh mutable sets per call so callers cannot alter the cache
+    return {name: (set(on_set), set(dc_set)) for name, (on_set, dc_set) in cached.items()}
+
+@lru_cache(maxsize=16)
+def _parse_sum_of_minterms_cached(
+    path: str, mtime_ns: int, size: int
+) -> Dict[str, Tuple[FrozenSet[int], FrozenSet[int]]]:
+    """Parse once per file version; mtime_ns/size only serve as the cache key."""
     import re
-    spec: Dict[str, Tuple[Set[int], Set[int]]] = {}
+    spec: Dict[str, Tuple[FrozenSet[int], FrozenSet[int]]] = {}
+    # One pass over the whole file; `ws` is whitespace other than newline
+    # so a match never spans two lines.
+    ws = r"[^\S\n]*"
+    body = r"\{((?:[0-9,]|[^\S\n])*)\}"
     pat = re.compile(
-        r"""^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\s*sum\s*\{\s*([0-9,\s]*)\s*\}\s*(?:\+?\s*d\s*\{\s*([0-9,\s]*)\s*\}\s*)?$"""
+        "^" + ws + r"([A-Za-z_][A-Za-z0-9_]*)" + ws + "=" + ws + "sum" + ws + body + ws
+        + r"(?:\+?" + ws + "d" + ws + body + ws + ")?$",
+        re.MULTILINE,
     )
+    num = re.compile(r"\d+")
     with open(path, "r", encoding="utf-8") as f:
-        for lineno, raw in enumerate(f, 1):
-            line = raw.strip()
-            if not line or line.startswith("#"):
-                continue
-            m = pat.match(line)
-            if not m:
-                raise ValueError(f"Line {lineno}: invalid format -> {raw.strip()}")
-            name, on_body, dc_body = m.group(1), m.group(2), m.group(3)
+        text = f.read()
 
-            def parse_list(body: Optional[str]) -> Set[int]:
-                if body is None or body.strip() == "":
-                    return set()
-                xs = []
-                for tok in body.split(','):
-                    tok = tok.strip()
-                    if tok == "":
-                        continue
-                    xs.append(int(tok))
-                return set(xs)
+    def check_gap(start: int, end: int) -> None:
+        # Text between two matches may only hold blank or comment lines
+        lineno = text.count("\n", 0, start) + 1
+        for offset, raw in enumerate(text[start:end].split("\n")):
+            line = raw.strip()
+            if line and not line.startswith("#"):
+                raise ValueError(f"Line {lineno + offset}: invalid format -> {line}")
 
-            on_set = parse_list(on_body)
-            dc_set = parse_list(dc_body)
-            spec[name] = (on_set, dc_set)
+    pos = 0
+    for m in pat.finditer(text):
+        check_gap(pos, m.start())
+        pos = m.end()
+        name, on_body, dc_body = m.group(1), m.group(2), m.group(3)
+        on_set = frozenset(map(int, num.findall(on_body)))
+        dc_set = frozenset(map(int, num.findall(dc_body or "")))
+        spec[name] = (on_set, dc_set)
+    check_gap(pos, len(text))
     if not spec:
         raise ValueError("No outputs found in the file.")
     return spec
@@ -163,21 +203,23 @@ def print_truth_table(
     if output_names is None:
         output_names = [f"f{i+1}" for i in range(M)]
 
+    # Assemble every row first and emit them with a single write
     header = " ".join(input_names + output_names)
-    print(header)
-    for xb, yb in zip(inputs_bits, outputs_trits):
-        row_in = " ".join(list(xb))
-        row_out = " ".join(list(yb))
-        print(f"{row_in} {row_out}")
+    chunks = [header + "\n"]
+    chunks.extend(f"{' '.join(xb)} {' '.join(yb)}\n" for xb, yb in zip(inputs_bits, outputs_trits))
+    sys.stdout.write("".join(chunks))
 
 def print_truth_table_markdown(
     inputs_bits: List[str],
     outputs_trits: List[str],
     input_names: Optional[List[str]] = None,
     output_names: Optional[List[str]] = None,
+    file: Optional[TextIO] = None,
 ) -> None:
+    """Write the truth table as Markdown to `file` (default: sys.stdout)."""
+    out = file if file is not None else sys.stdout
     if not inputs_bits or not outputs_trits:
-        print("_(empty truth table)_")
+        out.write("_(empty truth table)_\n")
         return
     N = len(inputs_bits[0])
     M = len(outputs_trits[0])
@@ -187,11 +229,12 @@ def print_truth_table_markdown(
         output_names = [f"f{i+1}" for i in range(M)]
 
     headers = input_names + output_names
-    print("| " + " | ".join(headers) + " |")
-    print("|" + "|".join(["---"] * len(headers)) + "|")
-    for xb, yb in zip(inputs_bits, outputs_trits):
-        row = list(xb) + list(yb)
-        print("| " + " | ".join(row) + " |")
+    chunks = [
+        "| " + " | ".join(headers) + " |\n",
+        "|" + "|".join(["---"] * len(headers)) + "|\n",
+    ]
+    chunks.extend("| " + " | ".join(xb + yb) + " |\n" for xb, yb in zip(inputs_bits, outputs_trits))
+    out.write("".join(chunks))
 
 # ---- Random spec generation (new) ----
 
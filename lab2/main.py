@@ -1,8 +1,6 @@
 from __future__ import annotations
 import os
 import sys
-from io import StringIO
-from contextlib import redirect_stdout
 from typing import List, Optional
 
 # Make Lab1 helpers importable (same I/O contract)
@@ -37,12 +35,8 @@ def _save_truth_table_markdown(
     output_names: List[str],
     out_path: str,
 ) -> None:
-    buf = StringIO()
-    with redirect_stdout(buf):
-        print_truth_table_markdown(inputs_bits, outputs_trits, input_names, output_names)
-    md = buf.getvalue()
     with open(out_path, "w", encoding="utf-8") as f:
-        f.write(md)
+        print_truth_table_markdown(inputs_bits, outputs_trits, input_names, output_names, file=f)
 
 
 def _cube_to_sop_term(cube: str, var_names: List[str]) -> str:
@@ -10,6 +10,7 @@ For production use with optimization, install and use the 'dd' package:
 """
 
 from __future__ import annotations
+from bisect import bisect_left
 from typing import Dict, Tuple, Set, List, Optional
 
 
@@ -20,6 +21,9 @@ class BDDNode:
     Terminal nodes have var=-1 and represent constants 0 or 1.
     """
 
+    # Fixed attribute layout: no per-instance __dict__ for large BDDs
+    __slots__ = ('var', 'low', 'high', 'id')
+
     def __init__(self, var: int, low: Optional['BDDNode'], high: Optional['BDDNode'], node_id: int):
         self.var = var          # Variable index (-1 for terminals)
         self.low = low          # Low (else) child
@@ -46,7 +50,6 @@ class BDD:
     def __init__(self, num_vars: int):
         """Initialize BDD manager for given number of variables."""
         self.num_vars = num_vars
-        self.next_id = 2  # 0, 1 reserved for terminal nodes
 
         # Terminal nodes: constant 0 and 1
         self.zero = BDDNode(-1, None, None, 0)
@@ -56,11 +59,19 @@ class BDD:
         # Ensures canonical representation
         self.unique_table: Dict[Tuple[int, int, int], BDDNode] = {}
 
-        # All nodes for traversal
-        self.all_nodes: Dict[int, BDDNode] = {
-            0: self.zero,
-            1: self.one
-        }
+        # All nodes for traversal, indexed by node ID
+        # (0, 1 reserved for terminal nodes; IDs are assigned in append order)
+        self.all_nodes: List[BDDNode] = [self.zero, self.one]
+
+        # Shannon cache: (var, truth-table slice) -> BDDNode
+        # Functionally identical sub-tables share one recursion
+        self._shannon_cache: Dict[Tuple[int, bytes], BDDNode] = {}
+
+        # Minterm-set cache: (var, ON offsets, DC offsets within block) -> BDDNode
+        self._minterm_cache: Dict[Tuple[int, Tuple[int, ...], Tuple[int, ...]], BDDNode] = {}
+
+        # Bitmask cache: (var, ON bits, DC bits within block) -> BDDNode
+        self._bitmask_cache: Dict[Tuple[int, int, int], BDDNode] = {}
 
     def make_node(self, var: int, low: BDDNode, high: BDDNode) -> BDDNode:
         """
@@ -73,16 +84,16 @@ class BDD:
         if low.id == high.id:
             return low
 
-        # Check unique table for existing node
+        # Check unique table for existing node (one hash lookup)
         key = (var, low.id, high.id)
-        if key in self.unique_table:
-            return self.unique_table[key]
+        node = self.unique_table.get(key)
+        if node is not None:
+            return node
 
         # Create new canonical node
-        node = BDDNode(var, low, high, self.next_id)
-        self.next_id += 1
+        node = BDDNode(var, low, high, len(self.all_nodes))
         self.unique_table[key] = node
-        self.all_nodes[node.id] = node
+        self.all_nodes.append(node)
         return node
 
     def build_from_truth_table(self, truth_table: List[int], var_names: List[str]) -> BDDNode:
@@ -101,11 +112,12 @@ class BDD:
                 f"Truth table size {len(truth_table)} != 2^{self.num_vars}"
             )
 
-        return self._shannon_expand(truth_table, 0, len(truth_table), 0)
+        # Pack once so every slice below is a compact, hashable bytes object
+        return self._shannon_expand(bytes(truth_table), 0, len(truth_table), 0)
 
     def _shannon_expand(
         self,
-        truth_table: List[int],
+        truth_table: bytes,
         start: int,
         end: int,
         var: int
@@ -116,11 +128,29 @@ class BDD:
         Shannon expansion: f = var' * f_low + var * f_high
         where f_low is f with var=0 and f_high is f with var=1.
         """
-        # Base case: check if function is constant
         values = truth_table[start:end]
-        if all(v == 0 for v in values):
+        key = (var, values)
+        cached = self._shannon_cache.get(key)
+        if cached is not None:
+            return cached
+
+        node = self._shannon_expand_uncached(truth_table, values, start, end, var)
+        self._shannon_cache[key] = node
+        return node
+
+    def _shannon_expand_uncached(
+        self,
+        truth_table: bytes,
+        values: bytes,
+        start: int,
+        end: int,
+        var: int
+    ) -> BDDNode:
+        """Shannon decomposition step for a slice not yet in the cache."""
+        # Base case: check if function is constant
+        if 1 not in values:
             return self.zero
-        if all(v == 1 for v in values):
+        if 0 not in values:
             return self.one
 
         # Shouldn't happen if truth table is correct size
@@ -143,7 +173,8 @@ class BDD:
         self,
         n_inputs: int,
         on_set: Set[int],
-        dc_set: Set[int]
+        dc_set: Set[int],
+        use_dont_cares: bool = False
     ) -> BDDNode:
         """
         Build BDD from minterm specification.
@@ -152,18 +183,152 @@ class BDD:
             n_inputs: Number of input variables
             on_set: Set of ON minterms (where function = 1)
             dc_set: Set of don't-care minterms
+            use_dont_cares: If True, assign don't-cares greedily: a
+                sub-range whose care points are all 0 (or all 1) becomes
+                that constant. This is a local choice per sub-range, so the
+                result is correct on every care point but not guaranteed
+                to have fewer nodes than the DC-as-0 build, and it differs
+                from the DC-as-0 golden model on DC minterms.
 
         Returns:
-            Root BDD node (don't-cares treated as 0)
+            Root BDD node (don't-cares treated as 0 unless use_dont_cares)
         """
-        # Convert to truth table (DC treated as 0 for canonical form)
-        truth_table = [
-            1 if i in on_set else 0
-            for i in range(2 ** n_inputs)
-        ]
+        if n_inputs != self.num_vars:
+            raise ValueError(
+                f"Truth table size {2 ** n_inputs} != 2^{self.num_vars}"
+            )
+
+        # Recurse on the sorted ON/DC sets directly instead of materializing
+        # the 2^n truth table (by default DC treated as 0 for canonical form)
+        size = 1 << n_inputs
+        on_sorted = sorted(i for i in on_set if 0 <= i < size)
+        dc_sorted = sorted(i for i in dc_set if 0 <= i < size) if use_dont_cares else []
+        return self._shannon_from_set(
+            on_sorted, 0, len(on_sorted), dc_sorted, 0, len(dc_sorted), 0, size, 0
+        )
 
-        var_names = [f"x{i}" for i in range(n_inputs)]
-        return self.build_from_truth_table(truth_table, var_names)
+    def _shannon_from_set(
+        self,
+        on_sorted: List[int],
+        i: int,
+        j: int,
+        dc_sorted: List[int],
+        p: int,
+        q: int,
+        lo: int,
+        hi: int,
+        var: int
+    ) -> BDDNode:
+        """
+        Shannon decomposition over the minterm range [lo, hi).
+
+        on_sorted[i:j] / dc_sorted[p:q] are exactly the ON / DC minterms
+        inside the range. The sub-function is constant 0 when it has no ON
+        minterm, and constant 1 when every non-DC minterm is ON.
+        """
+        n_on = j - i
+        if n_on == 0:
+            return self.zero
+        if n_on + (q - p) == hi - lo:
+            return self.one
+
+        # Shouldn't happen if the range is a power-of-two block
+        if var >= self.num_vars:
+            return self.one if on_sorted[i] == lo else self.zero
+
+        # Key on the ON/DC offsets inside the block: isomorphic sub-functions
+        # at the same level share one recursion
+        key = (
+            var,
+            tuple(x - lo for x in on_sorted[i:j]),
+            tuple(x - lo for x in dc_sorted[p:q]),
+        )
+        cached = self._minterm_cache.get(key)
+        if cached is not None:
+            return cached
+
+        mid = lo + (hi - lo) // 2
+        k = bisect_left(on_sorted, mid, i, j)
+        r = bisect_left(dc_sorted, mid, p, q)
+
+        # f_low: function when var=0
+        f_low = self._shannon_from_set(on_sorted, i, k, dc_sorted, p, r, lo, mid, var + 1)
+
+        # f_high: function when var=1
+        f_high = self._shannon_from_set(on_sorted, k, j, dc_sorted, r, q, mid, hi, var + 1)
+
+        node = self.make_node(var, f_low, f_high)
+        self._minterm_cache[key] = node
+        return node
+
+    def build_from_minterm_spec_bitmask(
+        self,
+        n_inputs: int,
+        on_mask: int,
+        dc_mask: int = 0,
+        use_dont_cares: bool = False
+    ) -> BDDNode:
+        """
+        Build BDD from minterm bitmasks (bit i set <=> minterm i in the set).
+
+        Same result as build_from_minterm_spec on the equivalent sets, but a
+        sub-range is just a shifted/masked int: constant tests and cache keys
+        are single big-int operations done in C.
+
+        Args:
+            n_inputs: Number of input variables
+            on_mask: ON minterms as a bitmask
+            dc_mask: Don't-care minterms as a bitmask
+            use_dont_cares: Same meaning as in build_from_minterm_spec
+
+        Returns:
+            Root BDD node
+        """
+        if n_inputs != self.num_vars:
+            raise ValueError(
+                f"Truth table size {2 ** n_inputs} != 2^{self.num_vars}"
+            )
+
+        size = 1 << n_inputs
+        full = (1 << size) - 1
+        return self._shannon_from_mask(
+            on_mask & full, (dc_mask & full) if use_dont_cares else 0, size, 0
+        )
+
+    def _shannon_from_mask(self, on_bits: int, dc_bits: int, width: int, var: int) -> BDDNode:
+        """
+        Shannon decomposition of a block of `width` minterms given as bitmasks.
+
+        Bit 0 is the first minterm of the block; the low half (var=0) is the
+        low `width // 2` bits.
+        """
+        if not on_bits:
+            return self.zero
+        full = (1 << width) - 1
+        if on_bits | dc_bits == full:
+            return self.one
+
+        # Shouldn't happen if the block is a power-of-two size
+        if var >= self.num_vars:
+            return self.one if on_bits & 1 else self.zero
+
+        key = (var, on_bits, dc_bits)
+        cached = self._bitmask_cache.get(key)
+        if cached is not None:
+            return cached
+
+        half = width >> 1
+        low_mask = (1 << half) - 1
+
+        # f_low: function when var=0
+        f_low = self._shannon_from_mask(on_bits & low_mask, dc_bits & low_mask, half, var + 1)
+
+        # f_high: function when var=1
+        f_high = self._shannon_from_mask(on_bits >> half, dc_bits >> half, half, var + 1)
+
+        node = self.make_node(var, f_low, f_high)
+        self._bitmask_cache[key] = node
+        return node
 
     def get_node_count(self) -> int:
         """Get total number of nodes (including terminals)."""
@@ -171,7 +336,8 @@ class BDD:
 
     def get_non_terminal_count(self) -> int:
         """Get number of internal (non-terminal) nodes."""
-        return sum(1 for n in self.all_nodes.values() if not n.is_terminal())
+        # Only the two terminals are stored without going through make_node
+        return len(self.all_nodes) - 2
 
     def print_bdd(self, root: BDDNode, indent: int = 0):
         """Print BDD structure (for debugging)."""
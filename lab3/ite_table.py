@@ -157,6 +157,36 @@ class ITETable:
         # Default: treat as MUX (will be decomposed)
         return Gate(GateType.MUX, output, [f, g, h], gate_id)
 
+    @staticmethod
+    def fold_mux(sel: str, a: str, b: str,
+                 zero: str = "1'b0", one: str = "1'b1") -> Optional[Tuple[GateType, List[str]]]:
+        """Reduce MUX (sel ? a : b) when an input is constant or a == b.
+
+        Args:
+            sel, a, b: MUX inputs
+            zero, one: Names of the constant signals
+
+        Returns:
+            (GateType, inputs) of the equivalent smaller gate, or None
+        """
+        if a == b or sel == one:
+            return GateType.BUFFER, [a]
+        if sel == zero:
+            return GateType.BUFFER, [b]
+        if a == one and b == zero:
+            return GateType.BUFFER, [sel]
+        if a == zero and b == one:
+            return GateType.NOT, [sel]
+        if b == zero:
+            return GateType.AND, [sel, a]       # sel·a
+        if a == one:
+            return GateType.OR, [sel, b]        # sel + b
+        if a == zero:
+            return GateType.LT, [sel, b]        # sel'·b
+        if b == one:
+            return GateType.LTE, [sel, a]       # sel' + a
+        return None
+
 
 def print_ite_table():
     """Print the complete ITE table for reference."""
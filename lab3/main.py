@@ -122,16 +122,12 @@ def run_bdd_synthesis(
 
         vgen = VerilogGenerator(netlist, module_name=module_name, output_name=output_name)
 
-        # Generate netlist module (DUT)
-        vgen.generate_module(sv_module_file)
-
-        # Generate behavioral golden model
+        # Generate netlist module (DUT), behavioral golden model and
+        # co-simulation testbench (random stimulus); files are written concurrently
         expected_outputs = _build_expected_outputs(inputs_bits, outputs_trits, output_idx)
-        vgen.generate_golden_model(sv_golden_file, expected_outputs)
-
-        # Generate co-simulation testbench (random stimulus)
         num_random_tests = 1000  # Number of random test vectors
-        vgen.generate_testbench(sv_tb_file, num_random_tests)
+        vgen.generate_all(sv_module_file, sv_golden_file, sv_tb_file,
+                          expected_outputs, num_random_tests)
 
         print(f"  Netlist (DUT):   {sv_module_file}")
         print(f"  Golden Model:    {sv_golden_file}")
@@ -6,7 +6,8 @@ and applying ITE-to-gate mappings.
 """
 
 from __future__ import annotations
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, TextIO, Tuple
+import heapq
 import sys
 import os
 
@@ -35,12 +36,16 @@ class Netlist:
         self.next_gate_id = 0
         self.next_wire_id = 0
 
+        # Bumped on every change to `gates`, so consumers can memoize cheaply
+        self.version = 0
+
         # Signal naming: node_id -> signal_name
         self.signal_map: Dict[int, str] = {}
 
     def add_gate(self, gate: Gate):
         """Add a gate to the netlist."""
         self.gates.append(gate)
+        self.version += 1
 
     def get_wire_name(self) -> str:
         """Generate a new internal wire name."""
@@ -132,14 +137,154 @@ class Netlist:
 
         self.add_gate(gate)
 
-    def print_netlist(self):
-        """Print netlist in human-readable format."""
-        print("\n=== Gate-Level Netlist ===")
-        print(f"Inputs: {', '.join(self.var_names)}")
-        print(f"Gates: {len(self.gates)}\n")
+    def copy(self) -> 'Netlist':
+        """Independent copy: gates and their input lists are duplicated."""
+        other = Netlist(self.num_inputs, list(self.var_names))
+        other.gates = [Gate(g.gate_type, g.output, list(g.inputs), g.id) for g in self.gates]
+        other.next_gate_id = self.next_gate_id
+        other.next_wire_id = self.next_wire_id
+        other.signal_map = dict(self.signal_map)
+        other.version = self.version
+        return other
+
+    def fold_muxes(self) -> int:
+        """Replace MUX gates that have a constant or repeated input.
+
+        ITETable.create_gate_for_ite only sees BDD terminals as signal
+        names, so BDD netlists consist of MUX and BUFFER gates; folding
+        turns e.g. MUX(x, n, 0) into AND(x, n), exposing AND/OR chains
+        to balance(). Output names and gate IDs are kept.
+
+        Returns:
+            Number of gates that were rewritten
+        """
+        folded = 0
+        for k, gate in enumerate(self.gates):
+            if gate.gate_type is not GateType.MUX:
+                continue
+            result = ITETable.fold_mux(*gate.inputs)
+            if result is not None:
+                gate_type, inputs = result
+                self.gates[k] = Gate(gate_type, gate.output, inputs, gate.id)
+                folded += 1
+        if folded:
+            self.version += 1
+        return folded
+
+    def get_depth(self) -> int:
+        """Logic depth: gates on the longest input-to-output path."""
+        level: Dict[str, int] = {}
+        for gate in self.gates:
+            level[gate.output] = 1 + max((level.get(i, 0) for i in gate.inputs), default=0)
+        return max(level.values(), default=0)
+
+    def balance(self, op_kinds: Tuple[GateType, ...] = (GateType.AND, GateType.OR)) -> int:
+        """Rebalance chains of one associative gate type to cut logic depth.
+
+        A chain is a tree of same-type gates in which every inner gate
+        drives only the next gate up. Its leaves are re-associated by
+        repeatedly combining the two earliest-arriving signals, which gives
+        a balanced tree when the leaves arrive together and never makes the
+        root later than before. The chain's wire names and gate IDs are
+        reused, so the gate count and the root output are unchanged.
+
+        Args:
+            op_kinds: Gate types treated as associative
+
+        Returns:
+            Number of chains that were rebuilt
+        """
+        producer = {gate.output: gate for gate in self.gates}
+        fanout: Dict[str, int] = {}
+        consumer: Dict[str, Gate] = {}
+        for gate in self.gates:
+            for inp in gate.inputs:
+                fanout[inp] = fanout.get(inp, 0) + 1
+                consumer[inp] = gate
+
+        def is_inner(gate: Gate) -> bool:
+            # Output feeds exactly one gate, of the same associative type
+            out = gate.output
+            return fanout.get(out) == 1 and consumer[out].gate_type is gate.gate_type
+
+        # Logic level of every signal (primary inputs and constants: 0)
+        level: Dict[str, int] = {}
+
+        def collect(gate: Gate, leaves: List[str], inner: List[Gate]) -> int:
+            # Left-to-right leaves of the chain below gate; returns its level
+            lvl = 0
+            for inp in gate.inputs:
+                sub = producer.get(inp)
+                if sub is not None and sub.gate_type is gate.gate_type and fanout.get(inp) == 1:
+                    inner.append(sub)
+                    lvl = max(lvl, collect(sub, leaves, inner))
+                else:
+                    leaves.append(inp)
+                    lvl = max(lvl, level.get(inp, 0))
+            return lvl + 1
+
+        rebuilt: Dict[int, List[Gate]] = {}   # id(root gate) -> replacement gates
+        dropped: Set[int] = set()             # id() of absorbed inner gates
+        for gate in self.gates:
+            if gate.gate_type not in op_kinds:
+                level[gate.output] = 1 + max((level.get(i, 0) for i in gate.inputs), default=0)
+                continue
+            if is_inner(gate):
+                continue  # handled from its chain root
+
+            leaves: List[str] = []
+            inner: List[Gate] = []
+            old_level = collect(gate, leaves, inner)
+            level[gate.output] = old_level
+            if not inner or any(len(g.inputs) != 2 for g in inner) or len(gate.inputs) != 2:
+                continue  # not a chain of 2-input gates
+
+            # Combine the two earliest signals until one is left; the
+            # sequence number keeps ties in leaf order
+            heap = [(level.get(sig, 0), seq, sig) for seq, sig in enumerate(leaves)]
+            heapq.heapify(heap)
+            spare = [(g.output, g.id) for g in reversed(inner)]
+            new_gates: List[Gate] = []
+            seq = len(heap)
+            while len(heap) > 1:
+                lvl_a, _, sig_a = heapq.heappop(heap)
+                lvl_b, _, sig_b = heapq.heappop(heap)
+                output, gate_id = spare.pop() if heap else (gate.output, gate.id)
+                new_gates.append(Gate(gate.gate_type, output, [sig_a, sig_b], gate_id))
+                level[output] = max(lvl_a, lvl_b) + 1
+                heapq.heappush(heap, (level[output], seq, output))
+                seq += 1
+
+            if level[gate.output] >= old_level:
+                # Nothing to gain: keep the original chain
+                level[gate.output] = old_level
+                continue
+            rebuilt[id(gate)] = new_gates
+            dropped.update(id(g) for g in inner)
+
+        if rebuilt:
+            gates: List[Gate] = []
+            for gate in self.gates:
+                if id(gate) in rebuilt:
+                    gates.extend(rebuilt[id(gate)])
+                elif id(gate) not in dropped:
+                    gates.append(gate)
+            self.gates = gates
+            self.version += 1
+        return len(rebuilt)
+
+    def print_netlist(self, file: Optional[TextIO] = None):
+        """Print netlist in human-readable format.
+
+        Args:
+            file: Stream to print to (default: sys.stdout)
+        """
+        print("\n=== Gate-Level Netlist ===", file=file)
+        print(f"Inputs: {', '.join(self.var_names)}", file=file)
+        print(f"Gates: {len(self.gates)}\n", file=file)
 
         for i, gate in enumerate(self.gates, 1):
-            print(f"  {i}. {gate}")
+            print(f"  {i}. {gate}", file=file)
 
     def get_stats(self) -> Dict[str, int]:
         """Get netlist statistics.
@@ -8,22 +8,172 @@ Generates:
 """
 
 from __future__ import annotations
-from typing import List, TextIO
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import Dict, List, Set, Tuple, Union
 
 # Handle both module import and direct execution
 try:
     from lab3.netlist import Netlist
-    from lab3.ite_table import Gate, GateType
+    from lab3.ite_table import Gate, GateType, ITETable
 except ModuleNotFoundError:
     from netlist import Netlist
-    from ite_table import Gate, GateType
+    from ite_table import Gate, GateType, ITETable
+
+
+# Truth-table bytes 0/1 -> ASCII '0'/'1' for int(..., 2)
+_BIT_DIGITS = bytes.maketrans(b"\0\1", b"01")
+
+# Constant literals in gate inputs -> the signals declared for them
+_CONST_SUB = {"1'b0": "const_0", "1'b1": "const_1"}
+_CONST_NAMES = frozenset(_CONST_SUB.values())
+
+# Fixed file sections as block templates filled by one str.format call
+# each (the SystemVerilog text in them has no braces).
+_MODULE_HEADER_TMPL = (
+    "// Generated SystemVerilog module from BDD netlist\n"
+    "// Inputs: {inputs}\n"
+    "// Gates: {num_gates}\n\n"
+    "module {module} (\n"
+    "{input_ports}"
+    "    output logic {out}\n"
+    ");\n\n"
+)
+
+_GOLDEN_HEADER_TMPL = (
+    "// Behavioral golden model (reference implementation)\n"
+    "// Auto-generated from truth table\n\n"
+    "module ref_model (\n"
+    "{input_ports}"
+    "    output {out}\n"
+    ");\n\n"
+)
+
+_TB_COSIM_HEADER_TMPL = (
+    "// Co-simulation testbench for {module}\n"
+    "// Compares gate-level netlist (DUT) against behavioral golden model\n"
+    "// Uses random stimulus for verification\n\n"
+    "module {tb};\n\n"
+)
+
+_TB_COSIM_SIGNALS_TMPL = (
+    "    // Testbench signals\n"
+    "{signals}"
+    "\n"
+    "    // DUT outputs\n"
+    "    logic dut_{out};\n"
+    "\n"
+    "    // Golden model outputs\n"
+    "    logic ref_{out};\n"
+    "\n"
+    "    int errors = 0;\n"
+    "    int test_count = 0;\n\n"
+)
+
+# Random-stimulus section of the co-simulation testbench
+_TB_COSIM_TEST_TMPL = (
+    "    // Test stimulus with random inputs\n"
+    "    initial begin\n"
+    "        $display(\"=\" * 70);\n"
+    "        $display(\"Co-Simulation Testbench\");\n"
+    "        $display(\"DUT: Gate-level netlist\");\n"
+    "        $display(\"REF: Behavioral golden model\");\n"
+    "        $display(\"=\" * 70);\n"
+    "        $display(\"\");\n\n"
+    "        // Initialize random seed\n"
+    "        $display(\"Starting random verification with %0d test vectors...\", {num_tests});\n"
+    "        $display(\"\");\n\n"
+    "        repeat ({num_tests}) begin\n"
+    "            // Generate random inputs\n"
+    "{rand_block}"
+    "            #10;  // Wait for propagation\n\n"
+    "            // Compare outputs\n"
+    "            test_count++;\n"
+    "            if (dut_{out} !== ref_{out}) begin\n"
+    "                errors++;\n"
+    "                $display(\"ERROR [Test %0d]: Mismatch!\", test_count);\n"
+    "                $display(\"  Inputs:  {input_display}\", {var_list});\n"
+    "                $display(\"  DUT out: %b\", dut_{out});\n"
+    "                $display(\"  REF out: %b\", ref_{out});\n"
+    "                $display(\"\");\n"
+    "            end\n"
+    "            if (test_count % 100 == 0)\n"
+    "                $display(\"  Progress: %0d/%0d tests completed...\", test_count, {num_tests});\n"
+    "        end\n\n"
+    "        $display(\"\");\n"
+    "        $display(\"=\" * 70);\n"
+    "        $display(\"Test Summary\");\n"
+    "        $display(\"=\" * 70);\n"
+    "        $display(\"Total tests: %0d\", test_count);\n"
+    "        $display(\"Passed:      %0d\", test_count - errors);\n"
+    "        $display(\"Failed:      %0d\", errors);\n"
+    "        $display(\"\");\n\n"
+    "        if (errors == 0) begin\n"
+    "            $display(\"*** VERIFICATION PASSED ***\");\n"
+    "            $display(\"DUT matches golden model on all test vectors!\");\n"
+    "        end else begin\n"
+    "            $display(\"*** VERIFICATION FAILED ***\");\n"
+    "            $display(\"%0d mismatches detected!\", errors);\n"
+    "        end\n"
+    "        $display(\"=\" * 70);\n\n"
+    "        $finish;\n"
+    "    end\n\n"
+)
 
 
 class VerilogGenerator:
     """Generates SystemVerilog code from netlist."""
 
+    # Widest function whose golden model is emitted as a single ROM constant;
+    # wider tables go to a $readmemh file next to the golden model
+    GOLDEN_ROM_MAX_INPUTS = 20
+
+    # Truth-table entries per word of the $readmemh ROM file
+    GOLDEN_ROM_WORD_BITS = 32
+
+    # Instance text per gate type, filled with %-formatting from
+    # i (gate index), o (output), a/b/c (inputs), k (MUX wire counter),
+    # n (inverted input wire, see _INVERTED_INPUT)
+    _GATE_TEMPLATES = {
+        GateType.BUFFER: "    buf g%(i)d (%(o)s, %(a)s);\n",
+        GateType.NOT: "    not g%(i)d (%(o)s, %(a)s);\n",
+        GateType.AND: "    and g%(i)d (%(o)s, %(a)s, %(b)s);\n",
+        GateType.OR: "    or g%(i)d (%(o)s, %(a)s, %(b)s);\n",
+        GateType.NAND: "    nand g%(i)d (%(o)s, %(a)s, %(b)s);\n",
+        GateType.NOR: "    nor g%(i)d (%(o)s, %(a)s, %(b)s);\n",
+        GateType.XOR: "    xor g%(i)d (%(o)s, %(a)s, %(b)s);\n",
+        GateType.XNOR: "    xnor g%(i)d (%(o)s, %(a)s, %(b)s);\n",
+        # GT: f > g = f·ḡ = AND(f, NOT(g))
+        GateType.GT: "    and g%(i)d_1 (%(o)s, %(a)s, %(n)s);\n",
+        # LT: f < g = f̄·g = AND(NOT(f), g)
+        GateType.LT: "    and g%(i)d_1 (%(o)s, %(n)s, %(b)s);\n",
+        # GTE: f ≥ g = f + ḡ = OR(f, NOT(g))
+        GateType.GTE: "    or g%(i)d_1 (%(o)s, %(a)s, %(n)s);\n",
+        # LTE: f ≤ g = f̄ + g = OR(NOT(f), g)
+        GateType.LTE: "    or g%(i)d_1 (%(o)s, %(n)s, %(b)s);\n",
+        # MUX: out = sel ? a : b = (sel & a) | (~sel & b), sel = input a
+        GateType.MUX: (
+            "    wire mux%(k)d_and0, mux%(k)d_and1;\n"
+            "    and g%(i)d_1 (mux%(k)d_and0, %(a)s, %(b)s);\n"
+            "    and g%(i)d_2 (mux%(k)d_and1, %(n)s, %(c)s);\n"
+            "    or g%(i)d_3 (%(o)s, mux%(k)d_and0, mux%(k)d_and1);\n"
+        ),
+    }
+
+    # Decomposed gates that need one input inverted: (input field, name of
+    # the NOT wire if this gate is the first to invert that signal)
+    _INVERTED_INPUT = {
+        GateType.GT: ('b', "gt%(i)d_not"),
+        GateType.LT: ('a', "lt%(i)d_not"),
+        GateType.GTE: ('b', "gte%(i)d_not"),
+        GateType.LTE: ('a', "lte%(i)d_not"),
+        GateType.MUX: ('a', "mux%(k)d_sel_n"),
+    }
+
     def __init__(self, netlist: Netlist, module_name: str = "circuit", output_name: str = "out",
-                 testbench_name: str = None):
+                 testbench_name: str = None, simplify: bool = True, optimization: int = 0,
+                 sim_dir: str = None):
         """Initialize generator.
 
         Args:
@@ -31,11 +181,78 @@ class VerilogGenerator:
             module_name: Name for the SystemVerilog module (DUT)
             output_name: Name for the output port (default: "out")
             testbench_name: Name for the testbench module (default: "{module_name}_tb")
+            simplify: Fold MUXes with a constant or repeated input into a
+                smaller gate instead of the full NOT/AND/AND/OR expansion
+            optimization: Netlist passes run before codegen on a copy of
+                netlist; 1 folds constant MUXes (Netlist.fold_muxes) and then
+                rebalances the resulting AND/OR chains (Netlist.balance) to
+                cut logic depth
+            sim_dir: Directory the simulator runs from; $readmemh paths in
+                the golden model are made relative to it (default: the ROM
+                file name only, i.e. simulated from the model's directory)
         """
+        if optimization >= 1:
+            # Work on a copy so the caller's netlist is left untouched; MUXes
+            # must be folded first, BDD netlists have no AND/OR gates before
+            netlist = netlist.copy()
+            netlist.fold_muxes()
+            netlist.balance()
         self.netlist = netlist
         self.module_name = module_name
         self.output_name = output_name
         self.testbench_name = testbench_name if testbench_name else f"{module_name}_tb"
+        self.simplify = simplify
+        self.sim_dir = sim_dir
+
+        # Encoded file contents keyed by everything they depend on, so
+        # repeated generate_* calls on an unchanged netlist skip the rendering
+        self._render_cache: Dict[Tuple, bytes] = {}
+
+    def _netlist_key(self) -> Tuple:
+        """Key of the netlist state and the names that appear in the output.
+
+        O(1): relies on Netlist.version, which every Netlist method that
+        changes the gates bumps. Call invalidate_cache() after editing
+        netlist.gates directly.
+        """
+        return (self.netlist.version, len(self.netlist.gates), self.module_name,
+                self.output_name, self.simplify)
+
+    def invalidate_cache(self):
+        """Drop all memoized file contents (e.g. after editing netlist.gates by hand)."""
+        self._render_cache.clear()
+
+    # Per-input text blocks shared by the module, golden model and testbench,
+    # built on first use (input names are fixed for the generator's lifetime)
+    @cached_property
+    def _var_list(self) -> str:
+        return ", ".join(self.netlist.var_names)
+
+    @cached_property
+    def _input_port_decls(self) -> str:
+        return "".join(f"    input  logic {var},\n" for var in self.netlist.var_names)
+
+    @cached_property
+    def _golden_port_decls(self) -> str:
+        return "".join(f"    input  {var},\n" for var in self.netlist.var_names)
+
+    @cached_property
+    def _port_map(self) -> str:
+        return "".join(f"        .{var}({var}),\n" for var in self.netlist.var_names)
+
+    @cached_property
+    def _signal_decls(self) -> str:
+        return "".join(f"    logic {var};\n" for var in self.netlist.var_names)
+
+    @cached_property
+    def _rand_block(self) -> str:
+        # One 32-bit draw per 32 inputs, split over the inputs by concatenation
+        words = ", ".join(["$urandom"] * -(-len(self.netlist.var_names) // 32))
+        return f"            {{{self._var_list}}} = {{{words}}};\n"
+
+    @cached_property
+    def _input_display(self) -> str:
+        return "  ".join("%b" for _ in self.netlist.var_names)
 
     def generate_module(self, filename: str):
         """Generate SystemVerilog module file.
@@ -43,232 +260,330 @@ class VerilogGenerator:
         Args:
             filename: Output .sv file path
         """
-        with open(filename, 'w') as f:
-            self._write_module_header(f)
-            self._write_wire_declarations(f)
-            self._write_gate_instances(f)
-            self._write_module_footer(f)
+        self._write_file(filename, self._module_bytes())
 
         print(f"Generated SystemVerilog module: {filename}")
 
-    def _write_module_header(self, f: TextIO):
-        """Write module header with ports."""
-        f.write(f"// Generated SystemVerilog module from BDD netlist\n")
-        f.write(f"// Inputs: {', '.join(self.netlist.var_names)}\n")
-        f.write(f"// Gates: {len(self.netlist.gates)}\n\n")
+    def generate_all(self, module_path: str, golden_path: str, tb_path: str,
+                     truth_table: Union[List[int], bytes], num_tests: int = 1000):
+        """Generate module, golden model and testbench in one call.
 
-        f.write(f"module {self.module_name} (\n")
+        The three files are rendered first, then written concurrently so
+        their disk IO overlaps. Messages are printed in a fixed order.
 
-        # Input ports
-        for i, var in enumerate(self.netlist.var_names):
-            f.write(f"    input  logic {var},\n")
+        Args:
+            module_path: Output .sv file path for the netlist module
+            golden_path: Output .v file path for the golden model
+            tb_path: Output testbench .sv file path
+            truth_table: Expected output (0/1) for each input combination
+            num_tests: Number of random test vectors (default: 1000)
+        """
+        jobs = [(module_path, self._module_bytes())]
+        jobs += self._golden_files(golden_path, truth_table)
+        jobs.append((tb_path, self._testbench_bytes(num_tests)))
+        with ThreadPoolExecutor(max_workers=3) as ex:
+            futs = [ex.submit(self._write_file, path, data) for path, data in jobs]
+            for fut in futs:
+                fut.result()
+
+        print(f"Generated SystemVerilog module: {module_path}")
+        print(f"Generated golden model: {golden_path}")
+        print(f"Generated co-simulation testbench: {tb_path}")
+
+    @staticmethod
+    def _write_file(filename: str, data: bytes):
+        """Write rendered bytes in one call."""
+        # Binary mode: no newline translation or incremental encoding
+        with open(filename, 'wb') as f:
+            f.write(data)
+
+    def _module_bytes(self) -> bytes:
+        """Render the netlist module (cached per netlist state)."""
+        key = ('module', self._netlist_key())
+        data = self._render_cache.get(key)
+        if data is None:
+            # Build the whole file in memory, then write it in one call
+            parts: List[str] = []
+            # Instances first: only they know which constants survive folding
+            gate_parts: List[str] = []
+            consts = self._write_gate_instances(gate_parts)
+            self._write_module_header(parts)
+            self._write_wire_declarations(parts, consts)
+            parts += gate_parts
+            self._write_module_footer(parts)
+            data = self._render_cache[key] = "".join(parts).encode("utf-8")
+        return data
+
+    def _write_module_header(self, parts: List[str]):
+        """Write module header with ports."""
+        parts.append(_MODULE_HEADER_TMPL.format(
+            inputs=self._var_list,
+            num_gates=len(self.netlist.gates),
+            module=self.module_name,
+            input_ports=self._input_port_decls,
+            out=self.output_name,
+        ))
 
-        # Output port
-        f.write(f"    output logic {self.output_name}\n")
-        f.write(");\n\n")
+    def _write_wire_declarations(self, parts: List[str], consts: Set[str]):
+        """Write internal wire declarations.
 
-    def _write_wire_declarations(self, f: TextIO):
-        """Write internal wire declarations."""
-        # Collect all internal wires (n0, n1, n2, ...)
-        wires = set()
+        Args:
+            parts: Output line buffer
+            consts: Constant signals (const_0/const_1) the gate instances use
+        """
+        # Collect internal wires (n0, n1, n2, ...)
+        # dict keeps first-seen order (gate emission order) and dedupes
+        wires: Dict[str, None] = {}
         for gate in self.netlist.gates:
             # Output wire
-            if gate.output.startswith('n'):
-                wires.add(gate.output)
-            # Input wires (excluding primary inputs and constants)
+            if gate.output[:1] == 'n':
+                wires[gate.output] = None
+            # Input wires (excluding primary inputs)
             for inp in gate.inputs:
-                if inp.startswith('n'):
-                    wires.add(inp)
+                if inp[:1] == 'n':
+                    wires[inp] = None
+        has_const_0 = "const_0" in consts
+        has_const_1 = "const_1" in consts
 
         if wires:
-            f.write("    // Internal wires\n")
-            for wire in sorted(wires):
-                f.write(f"    logic {wire};\n")
-            f.write("\n")
+            parts.append("    // Internal wires\n")
+            for wire in wires:
+                parts.append(f"    logic {wire};\n")
+            parts.append("\n")
 
         # Assign constants if used
-        has_const_0 = any("1'b0" in gate.inputs for gate in self.netlist.gates)
-        has_const_1 = any("1'b1" in gate.inputs for gate in self.netlist.gates)
-
         if has_const_0 or has_const_1:
-            f.write("    // Constants\n")
+            parts.append("    // Constants\n")
         if has_const_0:
-            f.write("    logic const_0 = 1'b0;\n")
+            parts.append("    logic const_0 = 1'b0;\n")
         if has_const_1:
-            f.write("    logic const_1 = 1'b1;\n")
+            parts.append("    logic const_1 = 1'b1;\n")
         if has_const_0 or has_const_1:
-            f.write("\n")
+            parts.append("\n")
+
+    def _write_gate_instances(self, parts: List[str]) -> Set[str]:
+        """Write gate instances using standard cell primitives.
 
-    def _write_gate_instances(self, f: TextIO):
-        """Write gate instances using standard cell primitives."""
-        f.write("    // Gate instances (standard cells)\n")
+        Returns:
+            Constant signals (const_0/const_1) the written instances reference
+        """
+        parts.append("    // Gate instances (standard cells)\n")
 
-        self.mux_wire_counter = 0  # Counter for MUX decomposition wires
+        # Per-call state, so the generator can be reused or run concurrently
+        mux_counter = [0]  # Counter for MUX decomposition wires
+        inverters: Dict[str, str] = {}  # signal -> wire holding its inverse
+        consts: Set[str] = set()
 
         for i, gate in enumerate(self.netlist.gates):
-            self._write_gate_instance(f, gate, i)
+            self._write_gate_instance(parts, gate, i, mux_counter, inverters, consts)
 
-        f.write("\n")
+        parts.append("\n")
+        return consts
 
-    def _write_gate_instance(self, f: TextIO, gate: Gate, index: int):
+    def _write_gate_instance(self, parts: List[str], gate: Gate, index: int,
+                             mux_counter: List[int], inverters: Dict[str, str],
+                             consts: Set[str]):
         """Write a single gate instance using standard cell primitives.
 
         Args:
-            f: File handle
+            parts: Output line buffer
             gate: Gate to instantiate
             index: Gate index for unique naming
+            mux_counter: One-element list holding the next MUX wire number
+            inverters: Signal -> wire carrying its inverse, shared across gates
+            consts: Collects the constant signals the instance references
         """
+        gate_type = gate.gate_type
+        tmpl = self._GATE_TEMPLATES.get(gate_type)
+        if tmpl is None:
+            return
+
         # Replace constants with signal names
-        inputs = []
-        for inp in gate.inputs:
-            if inp == "1'b0":
-                inputs.append("const_0")
-            elif inp == "1'b1":
-                inputs.append("const_1")
+        fields = {'i': index, 'o': gate.output}
+        for key, inp in zip('abc', gate.inputs):
+            fields[key] = _CONST_SUB.get(inp, inp)
+
+        if gate_type == GateType.MUX:
+            folded = self._fold_mux(fields['a'], fields['b'], fields['c']) if self.simplify else None
+            if folded is not None:
+                gate_type, inputs = folded
+                tmpl = self._GATE_TEMPLATES[gate_type]
+                fields = {'i': index, 'o': gate.output}
+                fields.update(zip('abc', inputs))
             else:
-                inputs.append(inp)
-
-        # Use Verilog standard cell primitives
-        if gate.gate_type == GateType.BUFFER:
-            f.write(f"    buf g{index} ({gate.output}, {inputs[0]});\n")
-
-        elif gate.gate_type == GateType.NOT:
-            f.write(f"    not g{index} ({gate.output}, {inputs[0]});\n")
-
-        elif gate.gate_type == GateType.AND:
-            f.write(f"    and g{index} ({gate.output}, {inputs[0]}, {inputs[1]});\n")
-
-        elif gate.gate_type == GateType.OR:
-            f.write(f"    or g{index} ({gate.output}, {inputs[0]}, {inputs[1]});\n")
-
-        elif gate.gate_type == GateType.NAND:
-            f.write(f"    nand g{index} ({gate.output}, {inputs[0]}, {inputs[1]});\n")
-
-        elif gate.gate_type == GateType.NOR:
-            f.write(f"    nor g{index} ({gate.output}, {inputs[0]}, {inputs[1]});\n")
-
-        elif gate.gate_type == GateType.XOR:
-            f.write(f"    xor g{index} ({gate.output}, {inputs[0]}, {inputs[1]});\n")
-
-        elif gate.gate_type == GateType.XNOR:
-            f.write(f"    xnor g{index} ({gate.output}, {inputs[0]}, {inputs[1]});\n")
-
-        elif gate.gate_type == GateType.GT:
-            # GT: f > g = f·ḡ = AND(f, NOT(g))
-            # Decompose into: NOT + AND
-            not_wire = f"gt{index}_not"
-            f.write(f"    wire {not_wire};\n")
-            f.write(f"    not g{index}_0 ({not_wire}, {inputs[1]});\n")
-            f.write(f"    and g{index}_1 ({gate.output}, {inputs[0]}, {not_wire});\n")
-
-        elif gate.gate_type == GateType.LT:
-            # LT: f < g = f̄·g = AND(NOT(f), g)
-            # Decompose into: NOT + AND
-            not_wire = f"lt{index}_not"
-            f.write(f"    wire {not_wire};\n")
-            f.write(f"    not g{index}_0 ({not_wire}, {inputs[0]});\n")
-            f.write(f"    and g{index}_1 ({gate.output}, {not_wire}, {inputs[1]});\n")
-
-        elif gate.gate_type == GateType.GTE:
-            # GTE: f ≥ g = f + ḡ = OR(f, NOT(g))
-            # Decompose into: NOT + OR
-            not_wire = f"gte{index}_not"
-            f.write(f"    wire {not_wire};\n")
-            f.write(f"    not g{index}_0 ({not_wire}, {inputs[1]});\n")
-            f.write(f"    or g{index}_1 ({gate.output}, {inputs[0]}, {not_wire});\n")
-
-        elif gate.gate_type == GateType.LTE:
-            # LTE: f ≤ g = f̄ + g = OR(NOT(f), g)
-            # Decompose into: NOT + OR
-            not_wire = f"lte{index}_not"
-            f.write(f"    wire {not_wire};\n")
-            f.write(f"    not g{index}_0 ({not_wire}, {inputs[0]});\n")
-            f.write(f"    or g{index}_1 ({gate.output}, {not_wire}, {inputs[1]});\n")
-
-        elif gate.gate_type == GateType.MUX:
-            # Decompose MUX into standard cells
-            # MUX: out = sel ? a : b
-            # out = (sel & a) | (~sel & b)
-            sel, a, b = inputs[0], inputs[1], inputs[2]
-
-            # Generate intermediate wire names
-            sel_n = f"mux{self.mux_wire_counter}_sel_n"
-            sel_and_a = f"mux{self.mux_wire_counter}_and0"
-            sel_n_and_b = f"mux{self.mux_wire_counter}_and1"
-            self.mux_wire_counter += 1
-
-            # Declare intermediate wires
-            f.write(f"    wire {sel_n}, {sel_and_a}, {sel_n_and_b};\n")
-
-            # Decompose: out = (sel & a) | (~sel & b)
-            f.write(f"    not g{index}_0 ({sel_n}, {sel});\n")
-            f.write(f"    and g{index}_1 ({sel_and_a}, {sel}, {a});\n")
-            f.write(f"    and g{index}_2 ({sel_n_and_b}, {sel_n}, {b});\n")
-            f.write(f"    or g{index}_3 ({gate.output}, {sel_and_a}, {sel_n_and_b});\n")
-
-    def _write_module_footer(self, f: TextIO):
+                fields['k'] = mux_counter[0]
+                mux_counter[0] += 1
+
+        # After folding: a folded MUX may no longer reference a constant
+        for key in 'abc':
+            if fields.get(key) in _CONST_NAMES:
+                consts.add(fields[key])
+
+        inverted = self._INVERTED_INPUT.get(gate_type)
+        if inverted is not None:
+            key, wire_tmpl = inverted
+            fields['n'] = self._get_not(parts, inverters, fields[key], wire_tmpl % fields, index)
+        elif gate_type == GateType.NOT:
+            # A plain NOT gate's output can serve later inversions too
+            inverters.setdefault(fields['a'], gate.output)
+
+        parts.append(tmpl % fields)
+
+    @staticmethod
+    def _get_not(parts: List[str], inverters: Dict[str, str], sig: str, wire: str,
+                 index: int) -> str:
+        """Return a wire carrying NOT(sig), emitting the inverter on first use.
+
+        Args:
+            parts: Output line buffer
+            inverters: Signal -> wire carrying its inverse
+            sig: Signal to invert
+            wire: Name for the new wire if sig has no inverter yet
+            index: Gate index for unique naming
+
+        Returns:
+            Name of the (possibly shared) inverted wire
+        """
+        cached = inverters.get(sig)
+        if cached is not None:
+            return cached
+        parts.append(f"    wire {wire};\n    not g{index}_0 ({wire}, {sig});\n")
+        inverters[sig] = wire
+        return wire
+
+    @staticmethod
+    def _fold_mux(sel: str, a: str, b: str):
+        """Reduce MUX (sel ? a : b) when an input is constant or a == b.
+
+        Args:
+            sel, a, b: MUX inputs, constants already renamed to const_0/const_1
+
+        Returns:
+            (GateType, inputs) of the equivalent smaller gate, or None
+        """
+        return ITETable.fold_mux(sel, a, b, zero="const_0", one="const_1")
+
+    def _write_module_footer(self, parts: List[str]):
         """Write module footer."""
-        f.write("endmodule\n")
+        parts.append("endmodule\n")
 
-    def generate_golden_model(self, filename: str, truth_table: List[int]):
+    def generate_golden_model(self, filename: str, truth_table: Union[List[int], bytes]):
         """Generate behavioral golden model from truth table.
 
+        Above GOLDEN_ROM_MAX_INPUTS inputs the table is also written to a
+        hex ROM file next to the model (same stem, .hex extension).
+
         Args:
             filename: Output .v file path for golden model
-            truth_table: Expected output for each input combination
+            truth_table: Expected output (0/1) for each input combination,
+                as a list or packed one byte per entry
         """
-        with open(filename, 'w') as f:
-            self._write_golden_header(f)
-            self._write_golden_logic(f, truth_table)
-            self._write_golden_footer(f)
+        for path, data in self._golden_files(filename, truth_table):
+            self._write_file(path, data)
 
         print(f"Generated golden model: {filename}")
 
-    def _write_golden_header(self, f: TextIO):
+    def _golden_files(self, filename: str,
+                      truth_table: Union[List[int], bytes]) -> List[Tuple[str, bytes]]:
+        """(path, contents) of the golden model and, if needed, its ROM file."""
+        # One byte per entry: compact, hashable as a cache key, C-level indexing
+        if not isinstance(truth_table, (bytes, bytearray)):
+            truth_table = bytes(truth_table)
+        if self.netlist.num_inputs <= self.GOLDEN_ROM_MAX_INPUTS:
+            return [(filename, self._golden_bytes(truth_table, None))]
+        rom_file = os.path.splitext(filename)[0] + ".hex"
+        return [(filename, self._golden_bytes(truth_table, self._rom_path(rom_file))),
+                (rom_file, self._golden_rom_bytes(truth_table))]
+
+    def _rom_path(self, rom_file: str) -> str:
+        """Path of rom_file as $readmemh sees it, i.e. relative to sim_dir."""
+        # $readmemh resolves relative paths against the simulator's cwd
+        if self.sim_dir is None:
+            return os.path.basename(rom_file)
+        rel = os.path.relpath(os.path.abspath(rom_file), os.path.abspath(self.sim_dir))
+        return rel.replace(os.sep, "/")
+
+    def _golden_bytes(self, truth_table: bytes, rom_path: Union[str, None]) -> bytes:
+        """Render the golden model (cached per truth table and ROM path)."""
+        key = ('golden', tuple(self.netlist.var_names), self.netlist.num_inputs,
+               self.output_name, bytes(truth_table), rom_path)
+        data = self._render_cache.get(key)
+        if data is None:
+            parts: List[str] = []
+            self._write_golden_header(parts)
+            self._write_golden_logic(parts, truth_table, rom_path)
+            self._write_golden_footer(parts)
+            data = self._render_cache[key] = "".join(parts).encode("utf-8")
+        return data
+
+    def _golden_rom_bytes(self, truth_table: bytes) -> bytes:
+        """Render the $readmemh file: one hex word per GOLDEN_ROM_WORD_BITS entries.
+
+        Bit j of word k is the output for input combination k * W + j.
+        """
+        key = ('golden_rom', self.netlist.num_inputs, bytes(truth_table))
+        data = self._render_cache.get(key)
+        if data is None:
+            size = 2 ** self.netlist.num_inputs
+            word_bits = min(self.GOLDEN_ROM_WORD_BITS, size)
+            digits = (word_bits + 3) // 4
+            values = bytes(truth_table[:size]).ljust(size, b"\0")
+            # Whole table as one hex number (entry 0 = LSB); its last
+            # `digits` characters are word 0, the ones before are word 1, ...
+            rom = f"{int(values[::-1].translate(_BIT_DIGITS), 2):0{(size + 3) // 4}x}"
+            words = [rom[i - digits:i] for i in range(len(rom), 0, -digits)]
+            data = self._render_cache[key] = ("\n".join(words) + "\n").encode("ascii")
+        return data
+
+    def _write_golden_header(self, parts: List[str]):
         """Write golden model header."""
-        f.write("// Behavioral golden model (reference implementation)\n")
-        f.write(f"// Auto-generated from truth table\n\n")
-        f.write("module ref_model (\n")
-
-        # Input ports
-        for i, var in enumerate(self.netlist.var_names):
-            f.write(f"    input  {var},\n")
-
-        # Output port
-        f.write(f"    output {self.output_name}\n")
-        f.write(");\n\n")
+        parts.append(_GOLDEN_HEADER_TMPL.format(
+            input_ports=self._golden_port_decls,
+            out=self.output_name,
+        ))
 
-    def _write_golden_logic(self, f: TextIO, truth_table: List[int]):
+    def _write_golden_logic(self, parts: List[str], truth_table: bytes,
+                            rom_path: Union[str, None] = None):
         """Write behavioral logic using truth table.
 
-        Uses a case statement for clarity and direct mapping from truth table.
+        Up to GOLDEN_ROM_MAX_INPUTS inputs the table is packed into one
+        constant vector indexed by the input concatenation (O(1) lines).
+        Wider functions read the table from rom_path with $readmemh
+        (see _golden_rom_bytes), so the model stays O(1) lines as well.
         """
         num_inputs = self.netlist.num_inputs
-
-        # Concatenate inputs for case statement
-        input_concat = "{" + ", ".join(self.netlist.var_names) + "}"
-
-        f.write("    // Behavioral implementation using truth table\n")
-        f.write(f"    reg {self.output_name}_reg;\n\n")
-        f.write("    always @(*) begin\n")
-        f.write(f"        case ({input_concat})\n")
-
-        # Generate case for each input combination
-        for i in range(2 ** num_inputs):
-            pattern = format(i, f'0{num_inputs}b')
-            output_val = truth_table[i] if i < len(truth_table) else 0
-
-            # Format: 3'b000: out_reg = 1'b0;
-            f.write(f"            {num_inputs}'b{pattern}: {self.output_name}_reg = 1'b{output_val};\n")
-
-        f.write("            default: {}_reg = 1'bx;\n".format(self.output_name))
-        f.write("        endcase\n")
-        f.write("    end\n\n")
-        f.write(f"    assign {self.output_name} = {self.output_name}_reg;\n\n")
-
-    def _write_golden_footer(self, f: TextIO):
+        size = 2 ** num_inputs
+
+        # Concatenate inputs: {x0, x1, ...} is the minterm index (x0 = MSB)
+        input_concat = "{" + self._var_list + "}"
+
+        if num_inputs <= self.GOLDEN_ROM_MAX_INPUTS:
+            # Bit i of the ROM is the output for input combination i
+            values = bytes(truth_table[:size]).ljust(size, b"\0")
+            rom = int(values[::-1].translate(_BIT_DIGITS), 2)
+            parts.append("    // Behavioral implementation using truth table ROM\n")
+            parts.append(f"    localparam [{size - 1}:0] TRUTH_TABLE = {size}'h{rom:0{(size + 3) // 4}x};\n\n")
+            parts.append(f"    assign {self.output_name} = TRUTH_TABLE[{input_concat}];\n\n")
+            return
+
+        word_bits = min(self.GOLDEN_ROM_WORD_BITS, size)
+        sel_bits = word_bits.bit_length() - 1
+        idx = f"{self.output_name}_idx"
+        parts.append(f"    // Behavioral implementation using truth table ROM ({rom_path})\n")
+        parts.append(f"    // Entry i is bit i % {word_bits} of word i / {word_bits}\n")
+        parts.append(f"    reg [{word_bits - 1}:0] TRUTH_TABLE [0:{size // word_bits - 1}];\n")
+        parts.append(f"    initial $readmemh(\"{rom_path}\", TRUTH_TABLE);\n\n")
+        parts.append(f"    wire [{num_inputs - 1}:0] {idx} = {input_concat};\n")
+        if sel_bits == num_inputs:
+            word = "0"
+        else:
+            word = f"{idx}[{num_inputs - 1}:{sel_bits}]"
+        bit = f"{idx}[{sel_bits - 1}:0]" if sel_bits else "0"
+        parts.append(f"    assign {self.output_name} = TRUTH_TABLE[{word}][{bit}];\n\n")
+
+    def _write_golden_footer(self, parts: List[str]):
         """Write golden model footer."""
-        f.write("endmodule\n")
+        parts.append("endmodule\n")
 
     def generate_testbench(self, filename: str, num_random_tests: int = 1000):
         """Generate SystemVerilog testbench with random stimulus and co-simulation.
@@ -277,151 +592,90 @@ class VerilogGenerator:
             filename: Output testbench .sv file path
             num_random_tests: Number of random test vectors (default: 1000)
         """
-        with open(filename, 'w') as f:
-            self._write_tb_cosim_header(f)
-            self._write_tb_cosim_signals(f)
-            self._write_tb_cosim_instances(f)
-            self._write_tb_cosim_test(f, num_random_tests)
-            self._write_tb_cosim_footer(f)
+        self._write_file(filename, self._testbench_bytes(num_random_tests))
 
         print(f"Generated co-simulation testbench: {filename}")
 
-    def _write_tb_cosim_header(self, f: TextIO):
+    def _testbench_bytes(self, num_random_tests: int) -> bytes:
+        """Render the co-simulation testbench (cached per test count)."""
+        key = ('tb', tuple(self.netlist.var_names), self.module_name, self.output_name,
+               self.testbench_name, num_random_tests)
+        data = self._render_cache.get(key)
+        if data is None:
+            parts: List[str] = []
+            self._write_tb_cosim_header(parts)
+            self._write_tb_cosim_signals(parts)
+            self._write_tb_cosim_instances(parts)
+            self._write_tb_cosim_test(parts, num_random_tests)
+            self._write_tb_cosim_footer(parts)
+            data = self._render_cache[key] = "".join(parts).encode("utf-8")
+        return data
+
+    def _write_tb_cosim_header(self, parts: List[str]):
         """Write co-simulation testbench header."""
-        f.write(f"// Co-simulation testbench for {self.module_name}\n")
-        f.write(f"// Compares gate-level netlist (DUT) against behavioral golden model\n")
-        f.write(f"// Uses random stimulus for verification\n\n")
-        f.write(f"module {self.testbench_name};\n\n")
+        parts.append(_TB_COSIM_HEADER_TMPL.format(module=self.module_name, tb=self.testbench_name))
 
-    def _write_tb_cosim_signals(self, f: TextIO):
+    def _write_tb_cosim_signals(self, parts: List[str]):
         """Write co-simulation testbench signals."""
-        f.write("    // Testbench signals\n")
-        for var in self.netlist.var_names:
-            f.write(f"    logic {var};\n")
-        f.write(f"\n")
-        f.write(f"    // DUT outputs\n")
-        f.write(f"    logic dut_{self.output_name};\n")
-        f.write(f"\n")
-        f.write(f"    // Golden model outputs\n")
-        f.write(f"    logic ref_{self.output_name};\n")
-        f.write(f"\n")
-        f.write("    int errors = 0;\n")
-        f.write("    int test_count = 0;\n\n")
-
-    def _write_tb_cosim_instances(self, f: TextIO):
+        parts.append(_TB_COSIM_SIGNALS_TMPL.format(
+            signals=self._signal_decls,
+            out=self.output_name,
+        ))
+
+    def _write_tb_cosim_instances(self, parts: List[str]):
         """Write DUT and golden model instantiations."""
         # DUT (netlist) instantiation
-        f.write("    // DUT: Gate-level netlist\n")
-        f.write(f"    {self.module_name} dut (\n")
-        for var in self.netlist.var_names:
-            f.write(f"        .{var}({var}),\n")
-        f.write(f"        .{self.output_name}(dut_{self.output_name})\n")
-        f.write("    );\n\n")
+        parts.append("    // DUT: Gate-level netlist\n")
+        parts.append(f"    {self.module_name} dut (\n")
+        parts.append(self._port_map)
+        parts.append(f"        .{self.output_name}(dut_{self.output_name})\n")
+        parts.append("    );\n\n")
 
         # Golden model instantiation
-        f.write("    // Golden Model: Behavioral reference\n")
-        f.write("    ref_model u_ref (\n")
-        for var in self.netlist.var_names:
-            f.write(f"        .{var}({var}),\n")
-        f.write(f"        .{self.output_name}(ref_{self.output_name})\n")
-        f.write("    );\n\n")
-
-    def _write_tb_cosim_test(self, f: TextIO, num_tests: int):
+        parts.append("    // Golden Model: Behavioral reference\n")
+        parts.append("    ref_model u_ref (\n")
+        parts.append(self._port_map)
+        parts.append(f"        .{self.output_name}(ref_{self.output_name})\n")
+        parts.append("    );\n\n")
+
+    def _write_tb_cosim_test(self, parts: List[str], num_tests: int):
         """Write random stimulus test with co-simulation.
 
         Args:
-            f: File handle
+            parts: Output line buffer
             num_tests: Number of random test vectors
         """
-        num_inputs = self.netlist.num_inputs
-
-        f.write("    // Test stimulus with random inputs\n")
-        f.write("    initial begin\n")
-        f.write("        $display(\"=\" * 70);\n")
-        f.write("        $display(\"Co-Simulation Testbench\");\n")
-        f.write("        $display(\"DUT: Gate-level netlist\");\n")
-        f.write("        $display(\"REF: Behavioral golden model\");\n")
-        f.write("        $display(\"=\" * 70);\n")
-        f.write("        $display(\"\");\n\n")
-
-        # Random seed
-        f.write("        // Initialize random seed\n")
-        f.write("        $display(\"Starting random verification with %0d test vectors...\", {});\n".format(num_tests))
-        f.write("        $display(\"\");\n\n")
-
-        # Test loop
-        f.write(f"        repeat ({num_tests}) begin\n")
-        f.write("            // Generate random inputs\n")
-
-        for var in self.netlist.var_names:
-            f.write(f"            {var} = $random;\n")
-
-        f.write("            #10;  // Wait for propagation\n\n")
-
-        f.write("            // Compare outputs\n")
-        f.write("            test_count++;\n")
-        f.write(f"            if (dut_{self.output_name} !== ref_{self.output_name}) begin\n")
-        f.write("                errors++;\n")
-
-        # Format error message
-        input_display = "  ".join([f"%b" for _ in self.netlist.var_names])
-        f.write(f"                $display(\"ERROR [Test %0d]: Mismatch!\", test_count);\n")
-        f.write(f"                $display(\"  Inputs:  {input_display}\", {', '.join(self.netlist.var_names)});\n")
-        f.write(f"                $display(\"  DUT out: %b\", dut_{self.output_name});\n")
-        f.write(f"                $display(\"  REF out: %b\", ref_{self.output_name});\n")
-        f.write("                $display(\"\");\n")
-        f.write("            end\n")
-
-        # Progress indicator (every 100 tests)
-        f.write("            if (test_count % 100 == 0)\n")
-        f.write("                $display(\"  Progress: %0d/%0d tests completed...\", test_count, {});\n".format(num_tests))
-
-        f.write("        end\n\n")
-
-        # Final report
-        f.write("        $display(\"\");\n")
-        f.write("        $display(\"=\" * 70);\n")
-        f.write("        $display(\"Test Summary\");\n")
-        f.write("        $display(\"=\" * 70);\n")
-        f.write("        $display(\"Total tests: %0d\", test_count);\n")
-        f.write("        $display(\"Passed:      %0d\", test_count - errors);\n")
-        f.write("        $display(\"Failed:      %0d\", errors);\n")
-        f.write("        $display(\"\");\n\n")
-
-        f.write("        if (errors == 0) begin\n")
-        f.write("            $display(\"*** VERIFICATION PASSED ***\");\n")
-        f.write("            $display(\"DUT matches golden model on all test vectors!\");\n")
-        f.write("        end else begin\n")
-        f.write("            $display(\"*** VERIFICATION FAILED ***\");\n")
-        f.write("            $display(\"%0d mismatches detected!\", errors);\n")
-        f.write("        end\n")
-        f.write("        $display(\"=\" * 70);\n\n")
-
-        f.write("        $finish;\n")
-        f.write("    end\n\n")
-
-    def _write_tb_cosim_footer(self, f: TextIO):
+        # Per-variable pieces come from the cached blocks, the rest is fixed text
+        parts.append(_TB_COSIM_TEST_TMPL.format(
+            num_tests=num_tests,
+            out=self.output_name,
+            rand_block=self._rand_block,
+            input_display=self._input_display,
+            var_list=self._var_list,
+        ))
+
+    def _write_tb_cosim_footer(self, parts: List[str]):
         """Write co-simulation testbench footer."""
-        f.write("endmodule\n")
+        parts.append("endmodule\n")
 
-    def _write_tb_test(self, f: TextIO, expected_outputs: List[int]):
+    def _write_tb_test(self, parts: List[str], expected_outputs: List[int]):
         """Write test stimulus and checking.
 
         Args:
-            f: File handle
+            parts: Output line buffer
             expected_outputs: Expected output for each input combination
         """
-        f.write("    // Test stimulus\n")
-        f.write("    initial begin\n")
-        f.write("        $display(\"Starting exhaustive test...\");\n")
-        f.write(f"        $display(\"Testing {2 ** self.netlist.num_inputs} input combinations\");\n")
-        f.write("        $display(\"\");\n\n")
+        parts.append("    // Test stimulus\n")
+        parts.append("    initial begin\n")
+        parts.append("        $display(\"Starting exhaustive test...\");\n")
+        parts.append(f"        $display(\"Testing {2 ** self.netlist.num_inputs} input combinations\");\n")
+        parts.append("        $display(\"\");\n\n")
 
         # Header
         output_col_name = self.output_name if len(self.output_name) <= 3 else "out"
         header = f"        $display(\"  " + "  ".join(self.netlist.var_names) + f"  | {output_col_name} | exp | status\");\n"
-        f.write(header)
-        f.write("        $display(\"  " + "-" * (len(self.netlist.var_names) * 4 + 20) + "\");\n\n")
+        parts.append(header)
+        parts.append("        $display(\"  " + "-" * (len(self.netlist.var_names) * 4 + 20) + "\");\n\n")
 
         # Test each combination
         num_inputs = self.netlist.num_inputs
@@ -430,41 +684,41 @@ class VerilogGenerator:
             pattern = format(i, f'0{num_inputs}b')
 
             # Set inputs
-            f.write("        // Test case {}\n".format(i))
+            parts.append("        // Test case {}\n".format(i))
             for j, bit in enumerate(pattern):
-                f.write(f"        {self.netlist.var_names[j]} = 1'b{bit};\n")
+                parts.append(f"        {self.netlist.var_names[j]} = 1'b{bit};\n")
 
             # Expected output
             exp_out = expected_outputs[i] if i < len(expected_outputs) else 0
-            f.write(f"        expected = 1'b{exp_out};\n")
-            f.write("        #10;\n\n")
+            parts.append(f"        expected = 1'b{exp_out};\n")
+            parts.append("        #10;\n\n")
 
             # Check result
-            f.write(f"        if ({self.output_name} !== expected) begin\n")
-            f.write("            errors++;\n")
+            parts.append(f"        if ({self.output_name} !== expected) begin\n")
+            parts.append("            errors++;\n")
 
             # Format output display
             input_display = "  ".join([f"%b" for _ in range(num_inputs)])
-            f.write(f"            $display(\"  {input_display}  |  %b  |  %b  | FAIL\", " +
+            parts.append(f"            $display(\"  {input_display}  |  %b  |  %b  | FAIL\", " +
                    ", ".join(self.netlist.var_names) + f", {self.output_name}, expected);\n")
-            f.write("        end else begin\n")
-            f.write(f"            $display(\"  {input_display}  |  %b  |  %b  | PASS\", " +
+            parts.append("        end else begin\n")
+            parts.append(f"            $display(\"  {input_display}  |  %b  |  %b  | PASS\", " +
                    ", ".join(self.netlist.var_names) + f", {self.output_name}, expected);\n")
-            f.write("        end\n\n")
+            parts.append("        end\n\n")
 
         # Final report
-        f.write("        $display(\"\");\n")
-        f.write("        if (errors == 0)\n")
-        f.write("            $display(\"*** TEST PASSED: All test cases passed! ***\");\n")
-        f.write("        else\n")
-        f.write("            $display(\"*** TEST FAILED: %0d errors detected ***\", errors);\n\n")
+        parts.append("        $display(\"\");\n")
+        parts.append("        if (errors == 0)\n")
+        parts.append("            $display(\"*** TEST PASSED: All test cases passed! ***\");\n")
+        parts.append("        else\n")
+        parts.append("            $display(\"*** TEST FAILED: %0d errors detected ***\", errors);\n\n")
 
-        f.write("        $finish;\n")
-        f.write("    end\n\n")
+        parts.append("        $finish;\n")
+        parts.append("    end\n\n")
 
-    def _write_tb_footer(self, f: TextIO):
+    def _write_tb_footer(self, parts: List[str]):
         """Write testbench footer."""
-        f.write("endmodule\n")
+        parts.append("endmodule\n")
 
 
 def example_verilog():
@@ -8,23 +8,9 @@ module ref_model (
     output out
 );
 
-    // Behavioral implementation using truth table
-    reg out_reg;
+    // Behavioral implementation using truth table ROM
+    localparam [7:0] TRUTH_TABLE = 8'h87;
 
-    always @(*) begin
-        case ({x0, x1, x2})
-            3'b000: out_reg = 1'b1;
-            3'b001: out_reg = 1'b1;
-            3'b010: out_reg = 1'b1;
-            3'b011: out_reg = 1'b0;
-            3'b100: out_reg = 1'b0;
-            3'b101: out_reg = 1'b0;
-            3'b110: out_reg = 1'b0;
-            3'b111: out_reg = 1'b1;
-            default: out_reg = 1'bx;
-        endcase
-    end
-
-    assign out = out_reg;
+    assign out = TRUTH_TABLE[{x0, x1, x2}];
 
 endmodule
@@ -9,8 +9,13 @@ Files are generated in specific directories:
   - tb/testbench.sv   : Co-simulation testbench
 """
 
-import sys
+import hashlib
+import heapq
+import io
 import os
+import pickle
+import sys
+from itertools import compress
 
 # Add lab3 to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -21,10 +26,151 @@ from lab3.verilog_gen import VerilogGenerator
 from lab1.truth_table import (
     parse_sum_of_minterms_file,
     build_outputs_from_minterm_indices,
+    build_single_output_from_minterm_indices,
 )
 
 
-def synthesize(spec_file, n_inputs, output_first_function_only=True):
+def extract_on_dc_sets(outputs_trits, output_idx):
+    """
+    Extract ON-set and DC-set indices of one output column.
+
+    Args:
+        outputs_trits: Truth table rows, one '0'/'1'/'-' char per output
+        output_idx: Column to extract
+
+    Returns:
+        (on_set, dc_set) as sets of minterm indices
+    """
+    if not outputs_trits or output_idx >= len(outputs_trits[0]):
+        return set(), set()
+
+    # All rows have the same width: join once, take the column with a
+    # strided slice and pick matching positions without a Python-level loop
+    col = "".join(outputs_trits).encode("ascii")[output_idx::len(outputs_trits[0])]
+    indices = range(len(col))
+    on_set = set(compress(indices, map(ord('1').__eq__, col)))
+    dc_set = set(compress(indices, map(ord('-').__eq__, col)))
+    return on_set, dc_set
+
+
+# Packed 0/1 bytes -> ASCII binary digits
+_BIT_DIGITS = bytes.maketrans(b"\0\1", b"01")
+
+# ON/DC-set entries shown in the log (SYNTH_VERBOSE=1 shows all)
+MINTERM_PREVIEW = 32
+
+# Bump when the cached payload layout changes; code changes in the
+# pipeline are picked up automatically through SYNTH_PIPELINE_MODULES
+SYNTH_CACHE_VERSION = 1
+SYNTH_CACHE_DIR = ".synth_cache"
+
+# Modules whose source feeds the cached result (parsing, BDD, netlist)
+SYNTH_PIPELINE_MODULES = ("lab1.truth_table", "lab3.bdd", "lab3.ite_table", "lab3.netlist", __name__)
+
+# Keys every cached payload must have (see _run_synthesis)
+_SYNTH_CACHE_KEYS = frozenset((
+    'out_names', 'on_set', 'dc_set', 'bdd_nodes', 'bdd_internal', 'netlist', 'expected_outputs',
+))
+
+
+def _format_minterm_set(minterms, limit=MINTERM_PREVIEW):
+    """
+    Sorted list for the log; only the `limit` smallest entries plus the size
+    unless SYNTH_VERBOSE is set (large sets would dominate the run time).
+    """
+    if len(minterms) <= limit or os.environ.get("SYNTH_VERBOSE"):
+        return str(sorted(minterms))
+    preview = ", ".join(map(str, heapq.nsmallest(limit, minterms)))
+    return f"[{preview}, ...] ({len(minterms)} minterms)"
+
+
+def _synth_cache_path(project_root, spec_file, n_inputs, output_first_function_only):
+    """Cache file for this (spec contents, n_inputs, mode) combination."""
+    with open(spec_file, 'rb') as f:
+        spec_bytes = f.read()
+    h = hashlib.blake2b(digest_size=8)
+    h.update(f"v{SYNTH_CACHE_VERSION}:{n_inputs}:{int(output_first_function_only)}:".encode())
+    # Any edit to the pipeline code yields a new key instead of a stale netlist
+    for name in SYNTH_PIPELINE_MODULES:
+        with open(sys.modules[name].__file__, 'rb') as f:
+            h.update(hashlib.blake2b(f.read(), digest_size=16).digest())
+    h.update(spec_bytes)
+    return os.path.join(project_root, SYNTH_CACHE_DIR, h.hexdigest() + ".pkl")
+
+
+def _load_synth_cache(path):
+    """Return the cached synthesis result, or None on miss/unreadable file."""
+    try:
+        with open(path, 'rb') as f:
+            result = pickle.load(f)
+    except Exception:
+        # Missing, truncated or foreign pickle: rebuild instead of failing
+        return None
+    if not isinstance(result, dict) or not _SYNTH_CACHE_KEYS <= result.keys():
+        return None
+    return result
+
+
+def _store_synth_cache(path, result):
+    """Write the synthesis result atomically (tmp file + rename)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def _run_synthesis(spec_file, n_inputs, output_first_function_only):
+    """
+    Parse the spec and build BDD + netlist for the first output.
+
+    Returns a dict with the values synthesize() prints and emits:
+    out_names, on_set, dc_set, bdd_nodes, bdd_internal, netlist,
+    expected_outputs.
+    """
+    spec = parse_sum_of_minterms_file(spec_file)
+    if output_first_function_only:
+        # Only one column is needed: skip the 2^n x n_out trit table
+        out_names = sorted(spec.keys())
+        on_set, dc_set = build_single_output_from_minterm_indices(n_inputs, spec, 0)
+    else:
+        _, outputs_trits, out_names = build_outputs_from_minterm_indices(n_inputs, spec)
+        on_set, dc_set = extract_on_dc_sets(outputs_trits, 0)
+
+    # Scatter the ON minterms into a zeroed byte table (one byte per entry)
+    expected_outputs = bytearray(1 << n_inputs)
+    for i in on_set:
+        expected_outputs[i] = 1
+
+    # Same table as a bitmask (bit i = minterm i) for the BDD build;
+    # DC minterms are treated as 0, so no DC mask is needed
+    on_mask = int(bytes(expected_outputs[::-1]).translate(_BIT_DIGITS), 2)
+    bdd = BDD(num_vars=n_inputs)
+    root = bdd.build_from_minterm_spec_bitmask(n_inputs, on_mask)
+
+    netlist = Netlist(num_inputs=n_inputs, var_names=[f"x{i}" for i in range(n_inputs)])
+    netlist.build_from_bdd(bdd, root, output_name="out")
+
+    return {
+        'out_names': out_names,
+        'on_set': on_set,
+        'dc_set': dc_set,
+        'bdd_nodes': bdd.get_node_count(),
+        'bdd_internal': bdd.get_non_terminal_count(),
+        'netlist': netlist,
+        'expected_outputs': bytes(expected_outputs),
+    }
+
+
+def _flush_log(out):
+    """Write the buffered log in one call and reset the buffer."""
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
+    out.seek(0)
+    out.truncate()
+
+
+def synthesize(spec_file, n_inputs, output_first_function_only=True, use_cache=True):
     """
     Run BDD synthesis and generate fixed-name output files.
 
@@ -32,68 +178,73 @@ def synthesize(spec_file, n_inputs, output_first_function_only=True):
         spec_file: Path to specification file
         n_inputs: Number of input variables
         output_first_function_only: Only synthesize first output (default: True)
+        use_cache: Reuse the pickled result in .synth_cache/ when the spec
+            contents and n_inputs are unchanged (default: True)
     """
-    print("=" * 70)
-    print("BDD Synthesis for Simulation")
-    print("=" * 70)
-    print()
+    # Log lines are buffered and written at phase boundaries
+    out = io.StringIO()
 
-    # Parse specification
-    print(f"Parsing: {spec_file}")
-    spec = parse_sum_of_minterms_file(spec_file)
-    inputs_bits, outputs_trits, out_names = build_outputs_from_minterm_indices(n_inputs, spec)
+    print("=" * 70, file=out)
+    print("BDD Synthesis for Simulation", file=out)
+    print("=" * 70, file=out)
+    print(file=out)
 
-    input_names = [f"x{i}" for i in range(n_inputs)]
+    # Determine paths relative to script directory
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(script_dir)
 
-    print(f"  Inputs:  {n_inputs} variables: {', '.join(input_names)}")
-    print(f"  Outputs: {len(out_names)} functions: {', '.join(out_names)}")
-    print()
+    # Parse specification (skipped, with BDD and netlist, on a cache hit)
+    print(f"Parsing: {spec_file}", file=out)
+    _flush_log(out)
+    cache_path = None
+    result = None
+    if use_cache:
+        cache_path = _synth_cache_path(project_root, spec_file, n_inputs,
+                                       output_first_function_only)
+        result = _load_synth_cache(cache_path)
+        if result is not None:
+            print(f"  Using cached synthesis: {os.path.relpath(cache_path, project_root)}", file=out)
+    if result is None:
+        result = _run_synthesis(spec_file, n_inputs, output_first_function_only)
+        if cache_path is not None:
+            _store_synth_cache(cache_path, result)
+
+    out_names = result['out_names']
+    on_set = result['on_set']
+    dc_set = result['dc_set']
+    netlist = result['netlist']
+    expected_outputs = result['expected_outputs']
+
+    # The netlist already holds x0..x{n-1}; don't build a second list
+    print(f"  Inputs:  {n_inputs} variables: {', '.join(netlist.var_names)}", file=out)
+    print(f"  Outputs: {len(out_names)} functions: {', '.join(out_names)}", file=out)
+    print(file=out)
 
     # Process first output only (or all if specified)
     output_idx = 0
     output_name = out_names[output_idx]
 
-    print(f"Synthesizing output: {output_name}")
-    print("-" * 70)
-
-    # Extract ON-set and DC-set
-    on_set = set()
-    dc_set = set()
-    for i, out_trit in enumerate(outputs_trits):
-        if output_idx < len(out_trit):
-            val = out_trit[output_idx]
-            if val == '1':
-                on_set.add(i)
-            elif val == '-':
-                dc_set.add(i)
+    print(f"Synthesizing output: {output_name}", file=out)
+    print("-" * 70, file=out)
 
-    print(f"  ON-set: {sorted(on_set)}")
-    print(f"  DC-set: {sorted(dc_set)}")
-    print()
+    print(f"  ON-set: {_format_minterm_set(on_set)}", file=out)
+    print(f"  DC-set: {_format_minterm_set(dc_set)}", file=out)
+    print(file=out)
 
     # Build BDD
-    print("Building BDD...")
-    bdd = BDD(num_vars=n_inputs)
-    root = bdd.build_from_minterm_spec(n_inputs, on_set, dc_set)
-    print(f"  BDD nodes: {bdd.get_node_count()} total, {bdd.get_non_terminal_count()} non-terminal")
-    print()
+    print("Building BDD...", file=out)
+    print(f"  BDD nodes: {result['bdd_nodes']} total, {result['bdd_internal']} non-terminal", file=out)
+    print(file=out)
 
     # Generate netlist
-    print("Generating netlist...")
-    netlist = Netlist(num_inputs=n_inputs, var_names=input_names)
-    netlist.build_from_bdd(bdd, root, output_name="out")
-
+    print("Generating netlist...", file=out)
     stats = netlist.get_stats()
     total_gates = sum(stats.values())
-    print(f"  Total gates: {total_gates}")
-    print()
+    print(f"  Total gates: {total_gates}", file=out)
+    print(file=out)
 
     # Generate files with fixed names
-    print("Generating output files...")
-
-    # Determine paths relative to script directory
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
+    print("Generating output files...", file=out)
 
     # Create directories if they don't exist
     src_dir = os.path.join(project_root, "src")
@@ -108,35 +259,34 @@ def synthesize(spec_file, n_inputs, output_first_function_only=True):
     model_file = os.path.join(model_dir, "ref_model.v")
     tb_file = os.path.join(tb_dir, "testbench.sv")
 
+    # script/Makefile runs vlog/vsim from script/
     vgen = VerilogGenerator(netlist, module_name="netlist", output_name="out",
-                           testbench_name="testbench")
-
-    # Generate netlist (DUT)
-    vgen.generate_module(netlist_file)
-    print(f"  ✓ Netlist:      {netlist_file}")
+                           testbench_name="testbench", sim_dir=script_dir)
 
-    # Generate golden model
-    expected_outputs = [1 if i in on_set else 0 for i in range(2 ** n_inputs)]
-    vgen.generate_golden_model(model_file, expected_outputs)
-    print(f"  ✓ Golden model: {model_file}")
+    # The generator prints its own lines: emit ours first to keep the order
+    _flush_log(out)
 
-    # Generate testbench
+    # Netlist (DUT), golden model and testbench are independent files:
+    # render them, then write all three concurrently
     num_tests = 1000
-    vgen.generate_testbench(tb_file, num_tests)
-    print(f"  ✓ Testbench:    {tb_file} ({num_tests} random tests)")
-    print()
-
-    print("=" * 70)
-    print("Synthesis Complete!")
-    print("=" * 70)
-    print()
-    print("Generated files:")
-    print(f"  DUT:       src/netlist.sv")
-    print(f"  Reference: model/ref_model.v")
-    print(f"  Testbench: tb/testbench.sv")
-    print()
-    print("Ready for simulation with 'make run'")
-    print()
+    vgen.generate_all(netlist_file, model_file, tb_file, expected_outputs, num_tests)
+    print(f"  ✓ Netlist:      {netlist_file}", file=out)
+    print(f"  ✓ Golden model: {model_file}", file=out)
+    print(f"  ✓ Testbench:    {tb_file} ({num_tests} random tests)", file=out)
+    print(file=out)
+
+    print("=" * 70, file=out)
+    print("Synthesis Complete!", file=out)
+    print("=" * 70, file=out)
+    print(file=out)
+    print("Generated files:", file=out)
+    print(f"  DUT:       src/netlist.sv", file=out)
+    print(f"  Reference: model/ref_model.v", file=out)
+    print(f"  Testbench: tb/testbench.sv", file=out)
+    print(file=out)
+    print("Ready for simulation with 'make run'", file=out)
+    print(file=out)
+    _flush_log(out)
 
 
 def main():
@@ -0,0 +1,91 @@
+"""Tests for lab3.netlist: MUX folding and AND/OR rebalancing."""
+
+import random
+import unittest
+
+from lab3.bdd import BDD
+from lab3.ite_table import GateType
+from lab3.netlist import Netlist
+from lab3.verilog_gen import VerilogGenerator
+
+_OPS = {
+    GateType.BUFFER: lambda a: a,
+    GateType.NOT: lambda a: 1 - a,
+    GateType.AND: lambda a, b: a & b,
+    GateType.OR: lambda a, b: a | b,
+    GateType.GT: lambda a, b: a & (1 - b),
+    GateType.LT: lambda a, b: (1 - a) & b,
+    GateType.GTE: lambda a, b: a | (1 - b),
+    GateType.LTE: lambda a, b: (1 - a) | b,
+    GateType.MUX: lambda s, a, b: a if s else b,
+}
+
+
+def build_netlist(truth_table):
+    """BDD-derived netlist for a truth table (x0 is the most significant bit)."""
+    n = (len(truth_table) - 1).bit_length()
+    names = [f"x{i}" for i in range(n)]
+    bdd = BDD(n)
+    root = bdd.build_from_truth_table(truth_table, names)
+    netlist = Netlist(num_inputs=n, var_names=names)
+    netlist.build_from_bdd(bdd, root, output_name="out")
+    return netlist
+
+
+def evaluate(netlist, minterm):
+    """Value of `out` at minterm, simulating the gates in order."""
+    n = netlist.num_inputs
+    values = {"1'b0": 0, "1'b1": 1}
+    for k, name in enumerate(netlist.var_names):
+        values[name] = (minterm >> (n - 1 - k)) & 1
+    for gate in netlist.gates:
+        values[gate.output] = _OPS[gate.gate_type](*(values[i] for i in gate.inputs))
+    return values["out"]
+
+
+class TestBalance(unittest.TestCase):
+
+    def test_bdd_and_chain_depth_drops(self):
+        # f = x0·x1·...·x7: the BDD netlist is a chain of 8 MUX/BUFFER gates
+        truth_table = [0] * 255 + [1]
+        netlist = build_netlist(truth_table)
+        self.assertEqual(netlist.get_stats()["AND"], 0)
+        depth_before = netlist.get_depth()
+
+        balanced = netlist.copy()
+        self.assertGreater(balanced.fold_muxes(), 0)
+        self.assertGreater(balanced.balance(), 0)
+
+        self.assertLess(balanced.get_depth(), depth_before)
+        self.assertEqual(len(balanced.gates), len(netlist.gates))
+        for m in range(256):
+            self.assertEqual(evaluate(balanced, m), truth_table[m])
+
+    def test_optimization_keeps_caller_netlist(self):
+        truth_table = [0] + [1] * 255   # f = x0 + x1 + ... + x7
+        netlist = build_netlist(truth_table)
+        before = [(g.gate_type, g.output, list(g.inputs)) for g in netlist.gates]
+        depth_before = netlist.get_depth()
+
+        vgen = VerilogGenerator(netlist, optimization=1)
+
+        self.assertEqual([(g.gate_type, g.output, list(g.inputs)) for g in netlist.gates], before)
+        self.assertIsNot(vgen.netlist, netlist)
+        self.assertLess(vgen.netlist.get_depth(), depth_before)
+
+    def test_fold_and_balance_preserve_function(self):
+        rng = random.Random(0)
+        for _ in range(100):
+            n = rng.randint(1, 7)
+            truth_table = [int(rng.random() < 0.4) for _ in range(1 << n)]
+            netlist = build_netlist(truth_table)
+            netlist.fold_muxes()
+            netlist.balance()
+            if len(set(truth_table)) == 1:
+                continue  # constant functions have no driven output
+            for m in range(1 << n):
+                self.assertEqual(evaluate(netlist, m), truth_table[m])
+
+
+if __name__ == "__main__":
+    unittest.main()
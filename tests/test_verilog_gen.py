@@ -0,0 +1,73 @@
+"""Tests for lab3.verilog_gen: constant declarations and golden-model ROM file."""
+
+import os
+import random
+import re
+import tempfile
+import unittest
+
+from lab3.ite_table import Gate, GateType
+from lab3.netlist import Netlist
+from lab3.verilog_gen import VerilogGenerator
+
+
+class TestConstantDeclarations(unittest.TestCase):
+
+    def setUp(self):
+        # n0 = x0 ? 1 : 0 folds to a BUF of x0 and no longer uses a constant
+        self.netlist = Netlist(1, ["x0"])
+        self.netlist.add_gate(Gate(GateType.MUX, "n0", ["x0", "1'b1", "1'b0"], 0))
+        self.netlist.add_gate(Gate(GateType.BUFFER, "out", ["n0"], 1))
+
+    def test_folded_constants_not_declared(self):
+        text = VerilogGenerator(self.netlist)._module_bytes().decode()
+        self.assertNotIn("const_", text)
+
+    def test_unfolded_constants_declared(self):
+        text = VerilogGenerator(self.netlist, simplify=False)._module_bytes().decode()
+        self.assertIn("logic const_0 = 1'b0;", text)
+        self.assertIn("logic const_1 = 1'b1;", text)
+
+
+class TestGoldenRom(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.n = 8
+        self.truth_table = bytes(rng.randint(0, 1) for _ in range(1 << self.n))
+        netlist = Netlist(self.n, [f"x{i}" for i in range(self.n)])
+        self.vgen = VerilogGenerator(netlist)
+        self.vgen.GOLDEN_ROM_MAX_INPUTS = 4   # force the $readmemh path
+
+    def test_readmemh_uses_file_name_only(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            model = os.path.join(tmp, "sub", "golden_model.v")
+            files = dict(self.vgen._golden_files(model, self.truth_table))
+        text = files[model].decode()
+        self.assertIn('$readmemh("golden_model.hex", TRUTH_TABLE);', text)
+        self.assertNotIn(tmp, text)
+        self.assertIn(os.path.join(tmp, "sub", "golden_model.hex"), files)
+
+    def test_readmemh_path_resolves_from_sim_dir(self):
+        # script/Makefile runs vsim from script/; synthesize.py writes the
+        # model to model/ref_model.v, so the ROM must be found from script/
+        with tempfile.TemporaryDirectory() as root:
+            sim_dir = os.path.join(root, "script")
+            model = os.path.join(root, "model", "ref_model.v")
+            self.vgen.sim_dir = sim_dir
+            files = dict(self.vgen._golden_files(model, self.truth_table))
+        rom_path = re.search(r'\$readmemh\("([^"]+)"', files[model].decode()).group(1)
+        self.assertEqual(rom_path, "../model/ref_model.hex")
+        self.assertIn(os.path.normpath(os.path.join(sim_dir, rom_path)), files)
+
+    def test_rom_words_hold_truth_table(self):
+        files = self.vgen._golden_files("golden_model.v", self.truth_table)
+        words = files[1][1].decode().split()
+        width = int(re.search(r"reg \[(\d+):0\] TRUTH_TABLE", files[0][1].decode()).group(1)) + 1
+        self.assertEqual(len(words), (1 << self.n) // width)
+        for m, expected in enumerate(self.truth_table):
+            self.assertEqual((int(words[m // width], 16) >> (m % width)) & 1, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()